@@ -0,0 +1,285 @@
+import argparse
+import asyncio
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+import bot
+
+# OFFLINE BENCHMARK FOR THE SLASH COMMAND HANDLERS
+# BUILDS A SYNTHETIC DATASET SHAPED LIKE nfl.import_ids / import_seasonal_data / import_weekly_data /
+# import_seasonal_rosters, PLUGS IT INTO THE BOT, AND DRIVES EACH COMMAND WITH A FAKE INTERACTION.
+# NO DISCORD CONNECTION OR NETWORK ACCESS NEEDED.
+#
+# USAGE: python bench.py --players 2000 --iterations 500 --concurrency 8
+
+FIRST_NAMES = [
+    'Josh', 'Patrick', 'Lamar', 'Justin', 'Christian', 'Tyreek', 'Travis', 'Davante', 'Derrick', 'Saquon',
+    'CeeDee', "Ja'Marr", 'Amon-Ra', 'Jalen', 'Joe', 'Dak', 'Brock', 'Puka', 'Jahmyr', 'Bijan',
+    'Mike', 'Chris', 'Kyle', 'George', 'Sam', 'DeVonta', 'A.J.', 'D.K.', 'Garrett', 'Cooper',
+]
+LAST_NAMES = [
+    'Allen', 'Mahomes', 'Jackson', 'Jefferson', 'McCaffrey', 'Hill', 'Kelce', 'Adams', 'Henry', 'Barkley',
+    'Lamb', 'Chase', 'St. Brown', 'Hurts', 'Burrow', 'Prescott', 'Purdy', 'Nacua', 'Gibbs', 'Robinson',
+    'Evans', 'Godwin', 'Pitts', 'Kittle', 'LaPorta', 'Smith', 'Brown', 'Metcalf', 'Wilson', 'Kupp',
+]
+TEAMS = [
+    'ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET', 'GB', 'HOU', 'IND', 'JAX', 'KC',
+    'LA', 'LAC', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG', 'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS',
+]
+
+# POSITION MIX AND PER-GAME MEANS: (SHARE, PASS YDS, RUSH YDS, REC YDS, RECEPTIONS)
+POSITION_PROFILES = {
+    'QB': (0.06, 220.0, 15.0, 0.0, 0.0),
+    'RB': (0.10, 0.0, 55.0, 18.0, 2.5),
+    'WR': (0.16, 0.0, 2.0, 50.0, 4.0),
+    'TE': (0.08, 0.0, 0.5, 30.0, 3.0),
+    'OL': (0.16, 0.0, 0.0, 0.0, 0.0),
+    'DL': (0.13, 0.0, 0.0, 0.0, 0.0),
+    'LB': (0.11, 0.0, 0.0, 0.0, 0.0),
+    'DB': (0.16, 0.0, 0.0, 0.0, 0.0),
+    'K': (0.02, 0.0, 0.0, 0.0, 0.0),
+    'P': (0.02, 0.0, 0.0, 0.0, 0.0),
+}
+
+STAT_COLUMNS = [
+    'completions', 'attempts', 'passing_yards', 'passing_tds', 'interceptions',
+    'carries', 'rushing_yards', 'rushing_tds', 'receptions', 'targets', 'receiving_yards', 'receiving_tds',
+    'fantasy_points', 'fantasy_points_ppr',
+]
+
+# BUILD (ids, seasonal, weekly, rosters) FRAMES FOR players PLAYERS OVER weeks WEEKS
+def make_dataset(players, weeks, season, seed=0):
+    rng = np.random.default_rng(seed)
+    positions = list(POSITION_PROFILES)
+    shares = np.array([POSITION_PROFILES[p][0] for p in positions])
+
+    gsis_ids = np.array([f'00-{i:07d}' for i in range(players)])
+    names = np.array([f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}' for _ in range(players)])
+    player_positions = rng.choice(positions, size=players, p=shares / shares.sum())
+    player_teams = rng.choice(TEAMS, size=players)
+
+    ids = pd.DataFrame({
+        'gsis_id': gsis_ids,
+        'name': names,
+        'merge_name': [bot.normalize_name(name) for name in names],
+        'position': player_positions,
+        'team': player_teams,
+    })
+
+    # EACH PLAYER APPEARS IN ~80% OF WEEKS
+    grid_player, grid_week = np.meshgrid(np.arange(players), np.arange(1, weeks + 1), indexing='ij')
+    played = rng.random(grid_player.shape) < 0.8
+    rows = grid_player[played]
+    n = len(rows)
+
+    profile = np.array([POSITION_PROFILES[p][1:] for p in player_positions])[rows]
+    passing_yards = rng.gamma(4.0, profile[:, 0] / 4.0 + 1e-9).round()
+    rushing_yards = rng.gamma(2.0, profile[:, 1] / 2.0 + 1e-9).round()
+    receiving_yards = rng.gamma(2.0, profile[:, 2] / 2.0 + 1e-9).round()
+    receptions = rng.poisson(profile[:, 3])
+    passing_tds = rng.poisson(passing_yards / 150.0)
+    rushing_tds = rng.poisson(rushing_yards / 90.0)
+    receiving_tds = rng.poisson(receiving_yards / 90.0)
+    interceptions = rng.poisson(passing_yards / 400.0)
+    fantasy_points = (
+        passing_yards * 0.04 + passing_tds * 4 - interceptions * 2
+        + rushing_yards * 0.1 + rushing_tds * 6 + receiving_yards * 0.1 + receiving_tds * 6
+    )
+
+    weekly = pd.DataFrame({
+        'player_id': gsis_ids[rows],
+        'player_name': names[rows],
+        'player_display_name': names[rows],
+        'position': player_positions[rows],
+        'recent_team': player_teams[rows],
+        'season': season,
+        'week': grid_week[played],
+        'season_type': np.where(grid_week[played] > 18, 'POST', 'REG'),
+        'opponent_team': rng.choice(TEAMS, size=n),
+        'completions': (passing_yards / 11).round(),
+        'attempts': (passing_yards / 7).round(),
+        'passing_yards': passing_yards,
+        'passing_tds': passing_tds,
+        'interceptions': interceptions,
+        'carries': (rushing_yards / 4.3).round(),
+        'rushing_yards': rushing_yards,
+        'rushing_tds': rushing_tds,
+        'receptions': receptions,
+        'targets': (receptions * 1.4).round(),
+        'receiving_yards': receiving_yards,
+        'receiving_tds': receiving_tds,
+        'fantasy_points': fantasy_points,
+        'fantasy_points_ppr': fantasy_points + receptions,
+    })
+
+    regular = weekly[weekly['season_type'] == 'REG']
+    grouped = regular.groupby('player_id')
+    seasonal = grouped[STAT_COLUMNS].sum().reset_index()
+    seasonal['games'] = grouped.size().values
+    seasonal['season'] = season
+    seasonal['season_type'] = 'REG'
+    seasonal['tgt_sh'] = rng.random(len(seasonal)) * 0.3
+    seasonal['ay_sh'] = rng.random(len(seasonal)) * 0.3
+
+    rosters = pd.DataFrame({
+        'season': season,
+        'team': player_teams,
+        'position': player_positions,
+        'depth_chart_position': player_positions,
+        'jersey_number': rng.integers(1, 99, size=players),
+        'status': 'ACT',
+        'player_name': names,
+        'player_id': gsis_ids,
+    })
+
+    return ids, seasonal, weekly, rosters
+
+# PLUG A SYNTHETIC DATASET INTO THE BOT'S GLOBALS THE SAME WAY load_nfl_data DOES
+def install_dataset(ids, seasonal, weekly, rosters, season):
+    ids = bot.compact_player_ids(ids)
+    manager = bot.SeasonDataManager(
+        lambda s: bot.build_season_data(s, seasonal, weekly, rosters, ids),
+        bot.SEASON_MEMORY_MB * 2**20,
+        pinned=[season]
+    )
+    manager.put(bot.build_season_data(season, seasonal, weekly, rosters, ids))
+    bot.player_ids, bot.seasons = ids, manager
+
+# STAND-INS FOR discord.Interaction - ONLY THE PARTS THE HANDLERS TOUCH
+class FakeResponse:
+    async def defer(self, *args, **kwargs):
+        pass
+
+    async def send_message(self, content=None, **kwargs):
+        pass
+
+class FakeFollowup:
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, content=None, **kwargs):
+        self.messages.append(content)
+
+class FakeInteraction:
+    def __init__(self):
+        self.response = FakeResponse()
+        self.followup = FakeFollowup()
+        self.namespace = SimpleNamespace()
+        self.user = SimpleNamespace(id=0, name='bench')
+
+# SOMETIMES DROP A CHARACTER SO FUZZY MATCHING GETS EXERCISED TOO
+def typo(rng, name):
+    if len(name) > 4 and rng.random() < 0.2:
+        i = int(rng.integers(1, len(name) - 1))
+        return name[:i] + name[i + 1:]
+    return name
+
+# ONE (CALLBACK, ARGS) GENERATOR PER COMMAND
+def make_scenarios(ids, weeks, rng):
+    names = ids['name'].tolist()
+    teams = sorted(ids['team'].unique())
+    stats = bot.STAT_SUGGESTIONS
+
+    return {
+        'playerstats': lambda: (bot.playerstats.callback, (typo(rng, rng.choice(names)),)),
+        'filterbystat': lambda: (
+            bot.filterbystat.callback,
+            (str(rng.choice(['QB', 'RB', 'WR', 'TE'])), str(rng.choice(stats)), float(rng.integers(0, 20)))
+        ),
+        'roster': lambda: (bot.roster.callback, (str(rng.choice(teams)),)),
+        'comparestats': lambda: (bot.comparestats.callback, (typo(rng, rng.choice(names)), typo(rng, rng.choice(names)))),
+        'weeklystats': lambda: (bot.weeklystats.callback, (typo(rng, rng.choice(names)), int(rng.integers(1, weeks + 1)))),
+        'injuryreport': lambda: (bot.injuryreport.callback, (typo(rng, rng.choice(names)),)),
+        'trend': lambda: (bot.trend.callback, (typo(rng, rng.choice(names)), int(rng.integers(1, weeks + 1)))),
+        'compareplayers': lambda: (
+            bot.compareplayers.callback, (', '.join(typo(rng, name) for name in rng.choice(names, int(rng.integers(2, 11)))),)
+        ),
+        'leaderboard': lambda: (
+            bot.leaderboard.callback,
+            (str(rng.choice(['QB', 'RB', 'WR', 'TE'])), ', '.join(rng.choice(stats, int(rng.integers(1, 5)), replace=False)))
+        ),
+    }
+
+# RUN iterations CALLS OF ONE COMMAND WITH concurrency CALLS IN FLIGHT, RETURN (LATENCIES, WALL TIME, ERRORS)
+async def run_command(scenario, iterations, concurrency):
+    latencies = []
+    errors = 0
+    remaining = iter(range(iterations))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            callback, args = scenario()
+            interaction = FakeInteraction()
+            start = time.perf_counter()
+            await callback(interaction, *args)
+            latencies.append(time.perf_counter() - start)
+            reply = interaction.followup.messages[-1] if interaction.followup.messages else ''
+            if str(reply).startswith('❌ Error') or reply == bot.BUSY_MESSAGE:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return latencies, time.perf_counter() - start, errors
+
+# PEAK PYTHON HEAP ALLOCATED WHILE RUNNING A FEW CALLS OF ONE COMMAND (SEPARATE PASS - tracemalloc IS SLOW)
+async def measure_peak_memory(scenario, iterations):
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    await run_command(scenario, iterations, 1)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - baseline
+
+async def main(args):
+    rng = np.random.default_rng(args.seed)
+    season = bot.DEFAULT_SEASON
+
+    start = time.perf_counter()
+    ids, seasonal, weekly, rosters = make_dataset(args.players, args.weeks, season, args.seed)
+    generated = time.perf_counter() - start
+
+    start = time.perf_counter()
+    install_dataset(ids, seasonal, weekly, rosters, season)
+    built = time.perf_counter() - start
+
+    data = bot.seasons.peek(season)
+    print(f"Synthetic dataset: {len(ids)} players, {len(weekly)} player-weeks (generated in {generated:.2f}s)")
+    print(f"Season data built in {built * 1000:.0f} ms (~{data.memory_bytes / 2**20:.1f} MB)")
+
+    if not args.cache:
+        bot.response_cache.maxsize = 0
+    print(f"Response cache: {'on' if args.cache else 'off'} | concurrency {args.concurrency} | {args.iterations} calls per command\n")
+
+    scenarios = make_scenarios(ids, args.weeks, rng)
+    selected = args.commands or list(scenarios)
+
+    print(f"{'command':<14}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'calls/s':>11}{'peak KB':>10}{'errors':>8}")
+    for name in selected:
+        # WARM UP SO FIRST-CALL COSTS DON'T SKEW THE NUMBERS
+        await run_command(scenarios[name], min(20, args.iterations), 1)
+
+        latencies, wall, errors = await run_command(scenarios[name], args.iterations, args.concurrency)
+        peak = await measure_peak_memory(scenarios[name], min(50, args.iterations))
+
+        latencies_ms = np.array(latencies) * 1000
+        print(
+            f"{name:<14}{np.percentile(latencies_ms, 50):>10.3f}{np.percentile(latencies_ms, 99):>10.3f}"
+            f"{latencies_ms.mean():>10.3f}{len(latencies) / wall:>11.0f}{peak / 1024:>10.0f}{errors:>8}"
+        )
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark NFLStatSnap command handlers against synthetic data")
+    parser.add_argument('--players', type=int, default=2000, help="number of synthetic players")
+    parser.add_argument('--weeks', type=int, default=18, help="weeks of weekly data per player")
+    parser.add_argument('--iterations', type=int, default=500, help="calls per command")
+    parser.add_argument('--concurrency', type=int, default=8, help="calls in flight at once")
+    parser.add_argument('--cache', action='store_true', help="leave the response cache on (off by default)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('commands', nargs='*', help="commands to run (default: all)")
+    asyncio.run(main(parser.parse_args()))
@@ -1,596 +1,3332 @@
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 import os
+import re
+import sys
+import signal
+import subprocess
+import bisect
+import asyncio
+import functools
+import copy
+import threading
+import itertools
+import time
+import random
+import json
+import hashlib
+import tarfile
+import tempfile
+import shutil
+import urllib.request
+from datetime import date
+from typing import Optional
+from collections import OrderedDict, namedtuple, deque, Counter
+from concurrent.futures import ThreadPoolExecutor, Future
+from aiohttp import web
 from dotenv import load_dotenv
 import nfl_data_py as nfl
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 from rapidfuzz import process, fuzz
 
 # LOAD ENVIRONMENT VARIABLES FROM .ENV FILE
 load_dotenv()
 TOKEN = os.getenv('DISCORD_TOKEN')
 
+# SHARDING SETTINGS - SEE run_sharded()
+# SHARD_COUNT=0 RUNS ONE UNSHARDED BOT. SHARD_COUNT ALONE RUNS EVERY SHARD IN THIS PROCESS, AND
+# SHARD_PROCESSES > 1 SPLITS THE SHARDS ACROSS THAT MANY WORKER PROCESSES UNDER ONE SUPERVISOR.
+# SHARD_WORKER / SHARD_IDS ARE SET BY THE SUPERVISOR FOR EACH WORKER IT STARTS - DON'T SET THEM IN .ENV
+SHARD_COUNT = int(os.getenv('SHARD_COUNT', 0))
+SHARD_PROCESSES = int(os.getenv('SHARD_PROCESSES', 1))
+SHARD_WORKER = os.getenv('SHARD_WORKER')
+SHARD_IDS = [int(shard) for shard in os.getenv('SHARD_IDS', '').split(',') if shard.strip()] or None
+
 # BOT SETUP WITH INTENTS
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
 
-bot = commands.Bot(command_prefix='!', intents=intents)
+if SHARD_COUNT:
+    bot = commands.AutoShardedBot(command_prefix='!', intents=intents, shard_count=SHARD_COUNT, shard_ids=SHARD_IDS)
+else:
+    bot = commands.Bot(command_prefix='!', intents=intents)
 
 # GLOBAL VARIABLES TO STORE DATA
-player_data = None
 player_ids = None
+seasons = None
+startup_done = False
+metrics_server = None
+
+# SEASON SETTINGS
+# **NOTE: 2025 REGULAR SEASON DATA NOT YET AVAILABLE, ONCE UPDATED, JUST SET DEFAULT_SEASON=2025 IN .ENV**
+DEFAULT_SEASON = int(os.getenv('DEFAULT_SEASON', 2024))
+FIRST_SEASON = 1999  # EARLIEST SEASON WITH SEASONAL/WEEKLY STATS IN NFL_DATA_PY
+SEASON_MEMORY_MB = int(os.getenv('SEASON_MEMORY_MB', 512))
+REFRESH_MINUTES = float(os.getenv('REFRESH_MINUTES', 60))
+
+# LOCAL SNAPSHOT SETTINGS - SET SNAPSHOT_DIR= (EMPTY) TO ALWAYS DOWNLOAD ON START
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', 'snapshots')
+SNAPSHOT_MAX_AGE_HOURS = float(os.getenv('SNAPSHOT_MAX_AGE_HOURS', 24))
+
+# DATA PACK MADE BY build_pack.py - WHEN SET, THE PLAYER LIST AND EVERY PACKED SEASON COME FROM IT
+DATA_PACK = os.getenv('DATA_PACK', '')
+
+# EVERY PUBLISHED SEASON DATASET GETS A NEW VERSION NUMBER
+dataset_versions = itertools.count(1)
+
+# ROSTER POSITION GROUPS, IN DISPLAY ORDER
+ROSTER_POSITIONS = ['QB', 'RB', 'WR', 'TE', 'OL', 'DL', 'LB', 'DB', 'K', 'P']
+
+# FUZZY MATCH SETTINGS
+NAME_MATCH_THRESHOLD = 60  # 60% SIMILARITY THRESHOLD
+NAME_CACHE_SIZE = int(os.getenv('NAME_CACHE_SIZE', 4096))
+
+# SMALL THREAD-SAFE LRU CACHE (WORKER THREADS SHARE IT)
+class LRUCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+# NORMALIZE A PLAYER NAME FOR MATCHING ("A.J. Brown" -> "aj brown")
+def normalize_name(name):
+    return ' '.join(re.sub(r"[^a-z0-9 ]", '', name.lower()).split())
+
+# RESULT OF A NAME LOOKUP: DISPLAY NAME, EVERY PLAYER_ID SHARING IT, AND THE MATCH SCORE
+NameMatch = namedtuple('NameMatch', ['name', 'player_ids', 'score'])
+
+# FUZZY-MATCH NAME INDEX, BUILT ONCE PER DATASET
+# CHOICES ARE DEDUPLICATED AND PRE-NORMALIZED, AND RESOLVED QUERIES ARE KEPT IN AN LRU CACHE
+# A QUERY THAT IS EXACTLY A PLAYER_ID (AN AUTOCOMPLETE CHOICE FOR A SHARED NAME) RESOLVES TO THAT PLAYER ALONE
+class NameIndex:
+    def __init__(self, names, player_ids):
+        self.ids_by_choice = {}
+        self.display_names = {}
+        self.names_by_id = {}
+        for name, player_id in zip(names, player_ids):
+            if not isinstance(name, str):
+                continue
+            key = normalize_name(name)
+            ids = self.ids_by_choice.setdefault(key, [])
+            self.display_names.setdefault(key, name)
+            self.names_by_id.setdefault(player_id, name)
+            if player_id not in ids:
+                ids.append(player_id)
+
+        self.choices = list(self.ids_by_choice)
+        self.cache = LRUCache(NAME_CACHE_SIZE)
+
+    def __len__(self):
+        return len(self.choices)
+
+    def _match_for(self, choice, score):
+        return NameMatch(self.display_names[choice], self.ids_by_choice[choice], score)
+
+    def _match_for_id(self, query):
+        player_id = query.strip()
+        name = self.names_by_id.get(player_id)
+        return NameMatch(name, [player_id], 100.0) if name is not None else None
+
+    # RESOLVE ONE QUERY, RETURNS A NameMatch OR None
+    def lookup(self, query):
+        by_id = self._match_for_id(query)
+        if by_id is not None:
+            return by_id
+
+        key = normalize_name(query)
+        cached = self.cache.get(key, False)
+        if cached is not False:
+            return cached
+
+        if key in self.ids_by_choice:
+            result = self._match_for(key, 100.0)
+        else:
+            match = process.extractOne(
+                key, self.choices, scorer=fuzz.ratio, processor=None, score_cutoff=NAME_MATCH_THRESHOLD
+            )
+            result = self._match_for(match[0], match[1]) if match else None
+
+        self.cache.put(key, result)
+        return result
+
+    # RESOLVE SEVERAL QUERIES AT ONCE - UNCACHED ONES ARE SCORED IN ONE BATCHED cdist CALL
+    def lookup_many(self, queries):
+        by_id = [self._match_for_id(q) for q in queries]
+        keys = [normalize_name(q) for q in queries]
+        results = {}
+        pending = []
+        for key, match in zip(keys, by_id):
+            if match is not None:
+                continue
+            cached = self.cache.get(key, False)
+            if cached is not False:
+                results[key] = cached
+            elif key in self.ids_by_choice:
+                results[key] = self._match_for(key, 100.0)
+            elif key not in pending:
+                pending.append(key)
+
+        if pending and self.choices:
+            scores = process.cdist(pending, self.choices, scorer=fuzz.ratio, processor=None)
+            for key, row in zip(pending, scores):
+                best = int(row.argmax())
+                score = float(row[best])
+                results[key] = self._match_for(self.choices[best], score) if score >= NAME_MATCH_THRESHOLD else None
+
+        for key, match in zip(keys, by_id):
+            if match is None:
+                results.setdefault(key, None)
+                self.cache.put(key, results[key])
+        return [match or results[key] for key, match in zip(keys, by_id)]
+
+# SEASON STAT FIELDS THE COMMANDS READ FROM EACH PLAYER
+PLAYER_STAT_FIELDS = [
+    'games', 'passing_yards', 'rushing_yards', 'receiving_yards', 'receptions',
+    'passing_tds', 'rushing_tds', 'receiving_tds', 'fantasy_points_ppr'
+]
+
+# ONE PLAYER'S SEASON LINE - __slots__ KEEPS EACH RECORD SMALL
+class PlayerRecord:
+    __slots__ = ['player_id', 'name', 'position'] + PLAYER_STAT_FIELDS
+
+    def __init__(self, player_id, name, position, *stats):
+        self.player_id = player_id
+        self.name = name
+        self.position = position
+        for field, value in zip(PLAYER_STAT_FIELDS, stats):
+            setattr(self, field, value)
+
+# COMPACT PLAYER_ID (GSIS_ID) -> PlayerRecord STORE FOR O(1) STAT LOOKUPS
+# player_data MUST ALREADY BE COMPACTED (SEE compact_season_frame)
+class PlayerStore:
+    def __init__(self, player_data):
+        named = player_data[player_data['name'].notna()]
+        stats = [named[field].astype(int if field == 'games' else float) for field in PLAYER_STAT_FIELDS]
+
+        self.records = {}
+        for row in zip(named['player_id'], named['name'], named['position'], *stats):
+            record = PlayerRecord(*row)
+            current = self.records.get(record.player_id)
+            if current is None or record.games > current.games:
+                self.records[record.player_id] = record
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, player_id):
+        return self.records.get(player_id)
+
+    # PICK THE RECORD FOR A NAME MATCH. COMMANDS TURN AWAY A NAME SEVERAL PLAYERS SHARE FIRST (SEE
+    # ambiguous_name_message), SO THE MOST-GAMES RULE ONLY SETTLES DUPLICATE ROWS FOR ONE PLAYER
+    def for_match(self, match):
+        candidates = [self.records[pid] for pid in match.player_ids if pid in self.records]
+        return max(candidates, key=lambda record: record.games) if candidates else None
+
+# MINIMUM GAMES PLAYED TO SHOW UP IN STAT FILTERS (UNLESS THE QUERY SAYS OTHERWISE, E.G. games>=3)
+MIN_GAMES = 6
+
+# STAT REGISTRY - EVERY STAT /filterbystat CAN FILTER OR SORT ON
+# fields ARE SEASON TOTALS SUMMED TOGETHER, per_game DIVIDES THAT SUM BY GAMES PLAYED,
+# aliases ARE OTHER NAMES USERS TYPE FOR THE SAME STAT
+StatDef = namedtuple('StatDef', ['key', 'label', 'fields', 'per_game', 'aliases'])
+
+STAT_REGISTRY = {stat.key: stat for stat in [
+    StatDef('passing_ypg', 'Passing YPG', ['passing_yards'], True, ['pass_ypg', 'passing_yards_per_game']),
+    StatDef('rushing_ypg', 'Rushing YPG', ['rushing_yards'], True, ['rush_ypg', 'rushing_yards_per_game']),
+    StatDef('receiving_ypg', 'Receiving YPG', ['receiving_yards'], True, ['rec_ypg', 'receiving_yards_per_game']),
+    StatDef('pass_tdpg', 'Pass TD/G', ['passing_tds'], True, ['passing_tdpg', 'pass_td_per_game']),
+    StatDef('tdpg', 'Total TD/G', ['rushing_tds', 'receiving_tds'], True, ['td_per_game', 'total_tdpg']),
+    StatDef('fppg', 'Fantasy PPG', ['fantasy_points_ppr'], True, [
+        'fantasy', 'fantasy_ppg', 'fantasy_points_per_game', 'fantasy_points', 'fantasy_ppr', 'fantasy_points_ppr'
+    ]),
+    StatDef('rec_pg', 'Receptions/G', ['receptions'], True, ['rec/g', 'recpg', 'receptions_per_game']),
+    StatDef('games', 'Games', ['games'], False, ['gp', 'games_played']),
+    StatDef('passing_yards', 'Passing Yards', ['passing_yards'], False, ['pass_yds', 'passing_yds']),
+    StatDef('rushing_yards', 'Rushing Yards', ['rushing_yards'], False, ['rush_yds', 'rushing_yds']),
+    StatDef('receiving_yards', 'Receiving Yards', ['receiving_yards'], False, ['rec_yds', 'receiving_yds']),
+    StatDef('receptions', 'Receptions', ['receptions'], False, ['rec']),
+    StatDef('passing_tds', 'Passing TDs', ['passing_tds'], False, ['pass_tds']),
+    StatDef('rushing_tds', 'Rushing TDs', ['rushing_tds'], False, ['rush_tds']),
+    StatDef('receiving_tds', 'Receiving TDs', ['receiving_tds'], False, ['rec_tds']),
+    StatDef('fantasy_total', 'Fantasy Points (Season)', ['fantasy_points_ppr'], False, ['total_fantasy_points', 'fantasy_points_total']),
+]}
+
+STAT_ALIASES = {alias: stat.key for stat in STAT_REGISTRY.values() for alias in [stat.key] + stat.aliases}
+
+# MAP A USER-TYPED STAT NAME TO A STAT_REGISTRY KEY (None IF UNKNOWN)
+def resolve_stat_key(stat):
+    return STAT_ALIASES.get(stat.strip().lower().replace(" ", "_"))
+
+# THE LOOSE KEYWORD MATCHING /filterbystat HAS ALWAYS USED FOR A BARE STAT NAME ("Fantasy PPR",
+# "pass ypg", "rush yards per game", ...), KEPT AS A FALLBACK SO THOSE STILL WORK (None IF NOTHING FITS)
+def resolve_loose_stat_key(stat):
+    stat_lower = stat.lower().replace(" ", "_")
+    if 'ypg' in stat_lower or 'yards_per_game' in stat_lower:
+        if 'pass' in stat_lower:
+            return 'passing_ypg'
+        if 'rush' in stat_lower:
+            return 'rushing_ypg'
+        if 'rec' in stat_lower or 'receiv' in stat_lower:
+            return 'receiving_ypg'
+        return None
+    if 'tdpg' in stat_lower or 'td_per_game' in stat_lower:
+        return 'pass_tdpg' if 'pass' in stat_lower else 'tdpg'
+    if 'fppg' in stat_lower or 'fantasy' in stat_lower:
+        return 'fppg'
+    if 'rec/g' in stat_lower or 'receptions_per_game' in stat_lower:
+        return 'rec_pg'
+    return None
+
+# PER-PLAYER STAT MATRIX, BUILT ONCE PER DATA LOAD
+# ROWS ARE PLAYERS, COLUMNS FOLLOW STAT_REGISTRY. FOR EACH (POSITION, STAT) THE POSITION'S ROWS ARE KEPT
+# PRE-SORTED BEST FIRST, SO A QUERY ONLY HAS TO MASK AN ORDERING - IT NEVER SORTS.
+# arrays, WHEN GIVEN, IS THE (values, percentiles) PAIR OF A MATRIX BUILT EARLIER FROM THE SAME PLAYERS
+# (E.G. MEMORY-MAPPED FROM A SNAPSHOT), USED INSTEAD OF RECOMPUTING THEM
+class StatMatrix:
+    def __init__(self, player_store, arrays=None):
+        records = list(player_store.records.values())
+        self.stat_keys = list(STAT_REGISTRY)
+        self.columns = {key: i for i, key in enumerate(self.stat_keys)}
+        self.row_of = {record.player_id: row for row, record in enumerate(records)}
+        self.names = [record.name for record in records]
+        self.positions = np.array([record.position for record in records], dtype=object)
+        self.games = np.array([record.games for record in records], dtype=np.int64)
+
+        if arrays is not None and all(array.shape == (len(records), len(self.stat_keys)) for array in arrays):
+            self.values, self.percentiles = arrays
+        else:
+            # ONE VECTORIZED DIVIDE FOR EVERY PER-GAME STAT OF EVERY PLAYER
+            totals = np.array(
+                [[sum(getattr(record, field) for field in stat.fields) for stat in STAT_REGISTRY.values()]
+                 for record in records],
+                dtype=np.float64
+            ).reshape(len(records), len(self.stat_keys))
+            per_game = np.array([stat.per_game for stat in STAT_REGISTRY.values()])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                averages = np.where(self.games[:, None] > 0, totals / self.games[:, None], 0.0)
+            self.values = np.where(per_game, averages, totals)
+
+            # PERCENTILE RANK OF EVERY STAT WITHIN THE PLAYER'S POSITION, IN ONE GROUPED RANK PASS:
+            # THE SHARE OF ELIGIBLE PLAYERS AT THAT POSITION WITH A STRICTLY LOWER VALUE (NaN IF INELIGIBLE)
+            # VALUES ARE RANKED ROUNDED, SO TOTALS SUMMED IN A DIFFERENT ORDER (A REFRESH ROLLING WEEKS ONTO
+            # OLD TOTALS VS A FULL REBUILD) STILL TIE INSTEAD OF SPLITTING ON THE LAST BIT
+            eligible = pd.DataFrame(np.where(self.games[:, None] >= MIN_GAMES, self.values.round(9), np.nan))
+            grouped = eligible.groupby(pd.Series(self.positions))
+            below = grouped.rank(method='min') - 1
+            self.percentiles = (below / grouped.transform('count') * 100).to_numpy(dtype=np.float32)
+
+        # PRE-SORTED ORDERINGS PER (POSITION, STAT), DESCENDING
+        self.position_set = set(self.positions.tolist())
+        self.orderings = {}
+        for position in self.position_set:
+            rows = np.flatnonzero(self.positions == position)
+            for key, col in self.columns.items():
+                self.orderings[(position, key)] = rows[np.argsort(-self.values[rows, col], kind='stable')]
+
+        self.memory_bytes = int(
+            self.values.nbytes + self.percentiles.nbytes + self.games.nbytes + self.positions.nbytes
+            + sum(order.nbytes for order in self.orderings.values())
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def value(self, row, stat_key):
+        return float(self.values[row, self.columns[stat_key]])
+
+    # A PLAYER'S PERCENTILE (0-99) FOR A STAT AMONG ELIGIBLE PLAYERS AT THEIR POSITION (None IF UNRANKED)
+    def percentile(self, player_id, stat_key):
+        row = self.row_of.get(player_id)
+        if row is None:
+            return None
+        pct = self.percentiles[row, self.columns[stat_key]]
+        return None if np.isnan(pct) else min(99, int(pct))
+
+# "1st", "2nd", "94th", ...
+def ordinal(n):
+    suffix = 'th' if 10 <= n % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
+    return f"{n}{suffix}"
+
+# A STAT VALUE WITH ITS POSITION PERCENTILE, E.G. "18.4 (94th pct WR)"
+def with_percentile(stat_matrix, player, stat_key, value):
+    pct = stat_matrix.percentile(player.player_id, stat_key)
+    if pct is None:
+        return f"{value}"
+    return f"{value} ({ordinal(pct)} pct {player.position})"
+
+# /filterbystat QUERY LANGUAGE: CONDITIONS JOINED WITH "and", E.G. "fppg>=15 and rec/g>5 and games>=10"
+QUERY_OPERATORS = {
+    '>=': np.greater_equal, '<=': np.less_equal, '>': np.greater, '<': np.less,
+    '=': np.equal, '==': np.equal, '!=': np.not_equal,
+}
+QUERY_CONDITION = re.compile(r'^\s*([a-z][a-z0-9_/ ]*?)\s*(>=|<=|==|!=|>|<|=)\s*(-?\d+(?:\.\d+)?)\s*$')
+QUERY_SEPARATOR = re.compile(r'\s+and\s+|\s*&&?\s*|\s*,\s*')
+
+class QueryError(ValueError):
+    pass
+
+Condition = namedtuple('Condition', ['stat_key', 'operator', 'value'])
+
+# A PARSED QUERY: ITS CONDITIONS, THE STAT TO SORT BY AND THE STATS TO SHOW FOR EACH PLAYER
+class CompiledQuery:
+    def __init__(self, conditions, sort_key):
+        self.conditions = conditions
+        self.sort_key = sort_key
+        self.columns = [STAT_REGISTRY[key] for key in dict.fromkeys([sort_key] + [c.stat_key for c in conditions])]
+        self.shown = [stat.key for stat in self.columns if stat.key != 'games']
+
+    # ROWS AT position MATCHING EVERY CONDITION, BEST FIRST BY sort_key
+    # ONE BOOLEAN MASK OVER THE PRE-SORTED ORDERING, SO THE RESULT IS ALREADY IN ORDER
+    def run(self, stat_matrix, position):
+        order = stat_matrix.orderings.get((position, self.sort_key))
+        if order is None:
+            return np.empty(0, dtype=np.int64)
+        mask = np.ones(len(order), dtype=bool)
+        for condition in self.conditions:
+            column = stat_matrix.values[order, stat_matrix.columns[condition.stat_key]]
+            mask &= QUERY_OPERATORS[condition.operator](column, condition.value)
+        return order[mask]
+
+# PARSE A QUERY ONCE - REPEATS OF THE SAME TEXT (AND SORT) COME STRAIGHT FROM THE CACHE
+# RAISES QueryError WITH A MESSAGE FOR THE USER WHEN THE QUERY DOESN'T PARSE
+@functools.lru_cache(maxsize=1024)
+def compile_query(text, sort=None):
+    conditions = []
+    for part in QUERY_SEPARATOR.split(text.strip().lower()):
+        match = QUERY_CONDITION.match(part)
+        if not match:
+            raise QueryError(f"Can't read `{part}` - write conditions like `fppg>=15 and games>=10`")
+        stat_key = resolve_stat_key(match.group(1))
+        if stat_key is None:
+            raise QueryError(f"Unknown stat: {match.group(1).strip()}. Try: {', '.join(STAT_SUGGESTIONS)}")
+        conditions.append(Condition(stat_key, match.group(2), float(match.group(3))))
+    return compile_conditions(tuple(conditions), sort)
+
+# BUILD A CompiledQuery FROM ALREADY-PARSED CONDITIONS (THE BARE stat + threshold FORM SKIPS THE PARSER)
+@functools.lru_cache(maxsize=1024)
+def compile_conditions(conditions, sort=None):
+    conditions = list(conditions)
+    
+    # THE MINIMUM-GAMES RULE APPLIES UNLESS THE QUERY SETS ITS OWN GAMES CONDITION
+    if not any(condition.stat_key == 'games' for condition in conditions):
+        conditions.append(Condition('games', '>=', MIN_GAMES))
+    
+    sort_key = resolve_stat_key(sort) if sort else conditions[0].stat_key
+    if sort_key is None:
+        raise QueryError(f"Unknown sort stat: {sort}. Try: {', '.join(STAT_SUGGESTIONS)}")
+    return CompiledQuery(tuple(conditions), sort_key)
+
+# PARSE A LIST OF STATS LIKE "fppg, rec/g, receiving_ypg" INTO STAT_REGISTRY KEYS, IN ORDER AND WITHOUT
+# REPEATS. RAISES QueryError WITH A MESSAGE FOR THE USER WHEN A NAME ISN'T A KNOWN STAT
+@functools.lru_cache(maxsize=1024)
+def parse_stat_list(text):
+    keys = []
+    for part in QUERY_SEPARATOR.split(text.strip().lower()):
+        if not part:
+            continue
+        stat_key = resolve_stat_key(part)
+        if stat_key is None:
+            raise QueryError(f"Unknown stat: {part}. Try: {', '.join(STAT_SUGGESTIONS)}")
+        keys.append(stat_key)
+    if not keys:
+        raise QueryError("List at least one stat, e.g. `fppg, rec/g, receiving_ypg`")
+    return tuple(dict.fromkeys(keys))
+
+# AUTOCOMPLETE SETTINGS - DISCORD SHOWS AT MOST 25 SUGGESTIONS, EACH AT MOST 100 CHARACTERS
+AUTOCOMPLETE_LIMIT = 25
+AUTOCOMPLETE_CHOICE_LENGTH = 100
+AUTOCOMPLETE_CACHE_SIZE = 2048
+
+# STAT NAMES OFFERED BY /filterbystat AUTOCOMPLETE, PER-GAME STATS FIRST
+STAT_SUGGESTIONS = ['passing_ypg', 'rushing_ypg', 'receiving_ypg', 'pass_tdpg', 'tdpg', 'fppg', 'rec/g'] + [
+    stat.key for stat in STAT_REGISTRY.values() if not stat.per_game
+]
+
+# PREFIX + FUZZY INDEX FOR PLAYER-NAME AUTOCOMPLETE
+# AUTOCOMPLETE FIRES ON EVERY KEYSTROKE AND RUNS ON THE EVENT LOOP, SO A LOOKUP IS A BISECT
+# OVER PRE-SORTED NAME SUFFIXES ("lamar jackson", "jackson"), WITH A FUZZY FALLBACK FOR TYPOS
+# SUGGESTIONS ARE (LABEL, VALUE) PAIRS: A NAME IS ITS OWN VALUE, BUT A NAME SEVERAL PLAYERS SHARE IS
+# OFFERED ONCE PER PLAYER, LABELLED FROM shared (E.G. "Mike Williams (WR, NYJ)") AND VALUED BY PLAYER_ID
+class AutocompleteIndex:
+    def __init__(self, ranked_names, shared=None):
+        self.shared = shared or {}
+        
+        # NAMES ARRIVE BEST-FIRST, SO A LOWER POSITION MEANS A MORE RELEVANT SUGGESTION
+        self.names = []
+        seen = set()
+        for name in ranked_names:
+            if isinstance(name, str) and name not in seen:
+                seen.add(name)
+                self.names.append(name)
+        self.normalized = [normalize_name(name) for name in self.names]
+
+        entries = []
+        for rank, key in enumerate(self.normalized):
+            tokens = key.split()
+            for start in range(len(tokens)):
+                entries.append((' '.join(tokens[start:]), rank))
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self.ranks = [rank for _, rank in entries]
+        self.cache = LRUCache(AUTOCOMPLETE_CACHE_SIZE)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _choices(self, names, limit):
+        pairs = []
+        for name in names:
+            pairs.extend(self.shared.get(name, [(name, name)]))
+        return pairs[:limit]
+
+    def suggest(self, query, limit=AUTOCOMPLETE_LIMIT):
+        key = normalize_name(query)
+        if not key:
+            return self._choices(self.names[:limit], limit)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        # PREFIX MATCHES ON ANY NAME TOKEN, MOST RELEVANT FIRST
+        ranks = set()
+        i = bisect.bisect_left(self.keys, key)
+        while i < len(self.keys) and self.keys[i].startswith(key) and len(ranks) < limit * 8:
+            ranks.add(self.ranks[i])
+            i += 1
+        suggestions = [self.names[rank] for rank in sorted(ranks)[:limit]]
+
+        # FALL BACK TO FUZZY MATCHING WHEN THE PREFIX SEARCH COMES UP SHORT (TYPOS)
+        if len(suggestions) < limit:
+            for _, _, rank in process.extract(
+                key, self.normalized, scorer=fuzz.WRatio, processor=None,
+                limit=limit, score_cutoff=NAME_MATCH_THRESHOLD
+            ):
+                name = self.names[rank]
+                if name not in suggestions:
+                    suggestions.append(name)
+                if len(suggestions) >= limit:
+                    break
+
+        suggestions = self._choices(suggestions, limit)
+        self.cache.put(key, suggestions)
+        return suggestions
+
+# CASE-INSENSITIVE FILTER FOR SHORT FIXED CHOICE LISTS (TEAMS, POSITIONS, STATS)
+def filter_choices(options, current):
+    current = current.lower()
+    starts = [option for option in options if option.lower().startswith(current)]
+    contains = [option for option in options if current in option.lower() and option not in starts]
+    return (starts + contains)[:AUTOCOMPLETE_LIMIT]
+
+def to_choices(values):
+    return [app_commands.Choice(name=value, value=value) for value in values if len(value) <= AUTOCOMPLETE_CHOICE_LENGTH]
+
+# SAME FOR AutocompleteIndex SUGGESTIONS, WHOSE LABEL AND VALUE CAN DIFFER
+def to_player_choices(pairs):
+    return [
+        app_commands.Choice(name=label, value=value) for label, value in pairs
+        if len(label) <= AUTOCOMPLETE_CHOICE_LENGTH and len(value) <= AUTOCOMPLETE_CHOICE_LENGTH
+    ]
+
+# FIELDS KEPT FOR EACH WEEKLY STAT LINE
+WEEKLY_FIELDS = [
+    'passing_yards', 'rushing_yards', 'receiving_yards', 'receptions',
+    'passing_tds', 'rushing_tds', 'receiving_tds', 'fantasy_points_ppr', 'opponent_team'
+]
+WEEKLY_STRING_FIELDS = ['player_id', 'name', 'resolved_position', 'opponent_team']
+
+# IN-MEMORY WEEKLY STATS INDEX, KEYED BY (PLAYER_ID, WEEK)
+# BUILT ONCE AFTER THE WEEKLY DATA IS DOWNLOADED SO /weeklystats NEVER HITS THE NETWORK
+# merged IS THE OUTPUT OF merge_weekly_names (OR A STORE'S OWN to_frame(), WHEN RESTORING A SNAPSHOT)
+class WeeklyStatsStore:
+    # PASS base TO BUILD A NEW STORE THAT EXTENDS AN EXISTING ONE WITH EXTRA WEEKS (base IS LEFT UNTOUCHED).
+    # PASS cumulative (A STORE'S OWN to_cumulative(), WHEN RESTORING A SNAPSHOT) TO REUSE ITS TREND TOTALS
+    def __init__(self, merged, base=None, cumulative=None):
+        # KEEP ONLY THE FIELDS /weeklystats SHOWS, AS ONE COLUMNAR FRAME. REPEATED STRINGS BECOME
+        # CATEGORICALS, AND A ROW ONLY BECOMES A DICT WHEN A COMMAND ASKS FOR IT
+        fields = [f for f in WEEKLY_FIELDS if f in merged.columns]
+        columns = ['player_id', 'name', 'week', 'resolved_position'] + fields
+        if list(merged.columns) != columns:
+            merged = merged[columns]
+        
+        frame = pd.concat([base.frame, merged], ignore_index=True) if base else merged
+        self.frame = frame = index_weekly_frame(frame)
+        # PLAIN NUMPY VIEWS FOR get(): (CODES, CATEGORIES) FOR CATEGORICALS, (VALUES, None) OTHERWISE
+        self.columns = {
+            col: (frame[col].cat.codes.to_numpy(), frame[col].cat.categories.to_numpy())
+            if isinstance(frame[col].dtype, pd.CategoricalDtype) else (frame[col].to_numpy(), None)
+            for col in frame.columns
+        }
+        self.weeks = frame['week'].to_numpy(dtype=np.int64)
+        self.last_week = int(self.weeks.max()) if len(frame) else 0
+        
+        # player_id -> (FIRST ROW, ONE PAST ITS LAST ROW)
+        starts = np.flatnonzero(np.diff(frame['player_id'].cat.codes.to_numpy(), prepend=-1))
+        stops = np.append(starts[1:], len(frame))
+        player_ids = frame['player_id'].to_numpy()[starts]
+        self.spans = dict(zip(player_ids, zip(starts.tolist(), stops.tolist())))
+        self.player_names = dict(zip(player_ids, frame['name'].to_numpy()[starts]))
+        
+        # RUNNING WEEKLY TOTALS FOR /trend, EXTENDED FROM THE BASE WITH ONLY THE NEW WEEKS
+        self.trends = WeeklyTrends(merged, self.last_week, base.trends if base else None, cumulative)
+        
+        # WHAT THE STORE KEEPS: THE FRAME, ITS INDEXES (THE KEYS ARE THE CATEGORIES' OWN STRINGS)
+        # AND THE TRENDS
+        self.memory_bytes = (
+            int(frame.memory_usage(deep=True).sum())
+            + sys.getsizeof(self.spans) + sum(sys.getsizeof(span) + sum(map(sys.getsizeof, span)) for span in self.spans.values())
+            + sys.getsizeof(self.player_names)
+            + self.trends.memory_bytes
+        )
+        
+        self.name_index = NameIndex(self.player_names.values(), self.player_names.keys())
+
+    def __len__(self):
+        return len(self.frame)
+
+    # ONE PLAYER-WEEK AS A DICT OF FIELD -> VALUE, OR None IF THE PLAYER DIDN'T PLAY THAT WEEK
+    def get(self, player_id, week):
+        span = self.spans.get(player_id)
+        if span is None:
+            return None
+        start, stop = span
+        row = start + int(np.searchsorted(self.weeks[start:stop], week))
+        if row == stop or self.weeks[row] != week:
+            return None
+        return {
+            col: values[row] if categories is None else categories[values[row]] if values[row] >= 0 else np.nan
+            for col, (values, categories) in self.columns.items()
+        }
+
+    def to_frame(self):
+        return self.frame
+
+    # THE TREND TOTALS WITH THEIR ROWS IN THE FRAME'S PLAYER ORDER, WHICH IS HOW A STORE BUILT FROM
+    # to_frame() INDEXES THEM
+    def to_cumulative(self):
+        return self.trends.cumulative[[self.trends.index[player_id] for player_id in self.spans]]
+
+# SORT WEEKLY ROWS BY PLAYER, THEN WEEK, SO EACH PLAYER'S WEEKS ARE ONE CONTIGUOUS RUN OF ROWS, AND KEEP
+# ONLY THE NEWEST COPY OF A REPEATED WEEK. A FRAME ALREADY IN THAT SHAPE (A STORE'S OWN to_frame() READ
+# BACK FROM A SNAPSHOT) IS RETURNED AS IS, SO ITS NUMERIC COLUMNS STAY VIEWS OF THE MAPPED FILE
+def index_weekly_frame(frame):
+    strings = [
+        col for col in WEEKLY_STRING_FIELDS
+        if col in frame.columns and not isinstance(frame[col].dtype, pd.CategoricalDtype)
+    ]
+    if strings:
+        frame = frame.astype({col: 'category' for col in strings})
+    
+    players = np.diff(frame['player_id'].cat.codes.to_numpy())
+    weeks = np.diff(frame['week'].to_numpy())
+    if ((players > 0) | ((players == 0) & (weeks > 0))).all():
+        return frame
+    frame = frame.drop_duplicates(['player_id', 'week'], keep='last')
+    return frame.sort_values(['player_id', 'week'], kind='stable').reset_index(drop=True)
+
+# WEEKLY FIELDS THAT ARE SUMMED INTO RUNNING TOTALS
+TREND_FIELDS = [f for f in WEEKLY_FIELDS if f != 'opponent_team']
+
+# CUMULATIVE PER-PLAYER WEEKLY SUMS: cumulative[player, week, field] IS THE PLAYER'S TOTAL THROUGH THAT WEEK
+# (WEEK 0 IS ALL ZEROS), WITH ONE EXTRA FIELD COUNTING GAMES PLAYED. ANY WINDOW OF WEEKS IS THEN THE
+# DIFFERENCE OF TWO SLICES - NO GROUPBY AT QUERY TIME. PASS base TO EXTEND ITS TOTALS WITH NEWER WEEKS,
+# OR cumulative (ROWS IN THE ORDER PLAYERS FIRST APPEAR IN merged) TO USE ALREADY-BUILT TOTALS AS IS
+class WeeklyTrends:
+    def __init__(self, merged, last_week, base=None, cumulative=None):
+        if cumulative is not None and base is None:
+            players = merged['player_id'].unique()
+            if cumulative.shape[:2] == (len(players), last_week + 1):
+                self.last_week = last_week
+                self.index = {player_id: row for row, player_id in enumerate(players)}
+                self.cumulative = cumulative
+                self.memory_bytes = int(cumulative.nbytes)
+                return
+        
+        first_week = base.last_week + 1 if base else 1
+        merged = merged[merged['week'] >= first_week]
+        self.last_week = max(last_week, first_week - 1)
+        self.index = dict(base.index) if base else {}
+        for player_id in merged['player_id'].unique():
+            self.index.setdefault(player_id, len(self.index))
+
+        # ONE SLOT PER (PLAYER, NEW WEEK): THE TREND_FIELDS, THEN A 1 FOR EACH WEEK THE PLAYER PLAYED
+        per_week = np.zeros((len(self.index), self.last_week - first_week + 1, len(TREND_FIELDS) + 1))
+        rows = merged['player_id'].map(self.index).to_numpy(dtype=np.int64)
+        weeks = merged['week'].to_numpy(dtype=np.int64) - first_week
+        per_week[rows, weeks, :-1] = np.nan_to_num(merged.reindex(columns=TREND_FIELDS).to_numpy(dtype=np.float64))
+        per_week[rows, weeks, -1] = 1
+
+        # PREFIX SUMS OVER THE NEW WEEKS, CARRYING ON FROM THE BASE'S LAST WEEK
+        earlier = np.zeros((len(self.index), base.cumulative.shape[1] if base else 1, per_week.shape[2]))
+        if base:
+            earlier[:len(base.index)] = base.cumulative
+        self.cumulative = np.concatenate([earlier, earlier[:, -1:] + np.cumsum(per_week, axis=1)], axis=1)
+        self.memory_bytes = int(self.cumulative.nbytes)
+
+    # TOTALS (BY FIELD) AND GAMES PLAYED FOR WEEKS first..last INCLUSIVE, OR None FOR AN UNKNOWN PLAYER
+    def window(self, player_id, first, last):
+        row = self.index.get(player_id)
+        if row is None:
+            return None
+        first, last = max(first, 1), min(last, self.last_week)
+        totals = self.cumulative[row, last] - self.cumulative[row, first - 1]
+        return dict(zip(TREND_FIELDS, totals[:-1].tolist())), int(totals[-1])
+
+# MERGE PLAYER NAMES WITH WEEKLY STATS, RESOLVING THE POSITION COLUMN ONCE INSTEAD OF PER LOOKUP
+def merge_weekly_names(weekly_data, player_ids):
+    merged = weekly_data.merge(
+        player_ids[['gsis_id', 'name', 'position']],
+        left_on='player_id',
+        right_on='gsis_id',
+        how='left'
+    )
+    merged = merged[merged['name'].notna()]
+
+    if 'position_y' in merged.columns:
+        positions = merged['position_y'].fillna(merged.get('position_x', 'N/A'))
+    else:
+        positions = merged['position']
+    return merged.assign(resolved_position=positions.fillna('N/A'))
+
+# PREBUILT PER-TEAM ROSTERS: TEAM -> {POSITION: [NAMES]}
+# BUILT ONCE AFTER THE ROSTER DATA IS DOWNLOADED SO /roster ONLY HAS TO FORMAT
+# merged IS THE OUTPUT OF merge_roster_names (OR A CACHE'S OWN to_frame(), WHEN RESTORING A SNAPSHOT)
+class RosterCache:
+    def __init__(self, merged):
+        merged = merged.loc[merged['name'].notna() & merged['position'].isin(ROSTER_POSITIONS), ['team', 'position', 'name']]
+        self.memory_bytes = int(merged.memory_usage(deep=True).sum())
+
+        # ONE GROUPBY PASS INSTEAD OF A BOOLEAN MASK PER TEAM AND POSITION
+        self.teams = {}
+        for (team, pos), names in merged.groupby(['team', 'position'], sort=False)['name']:
+            self.teams.setdefault(team, {})[pos] = names.tolist()
+
+    def __len__(self):
+        return len(self.teams)
+
+    def get(self, team):
+        return self.teams.get(team)
+
+    def to_frame(self):
+        return pd.DataFrame(
+            [(team, pos, name) for team, positions in self.teams.items()
+             for pos, names in positions.items() for name in names],
+            columns=['team', 'position', 'name']
+        )
+
+# MERGE PLAYER NAMES WITH ROSTERS
+def merge_roster_names(rosters, player_ids):
+    return rosters.merge(
+        player_ids[['gsis_id', 'name']],
+        left_on='player_id',
+        right_on='gsis_id',
+        how='left'
+    )
+
+# PLAY-BY-PLAY USAGE SETTINGS
+# THE SAME NFLVERSE FILE nfl.import_pbp_data READS, BUT import_pbp_data MATERIALISES THE WHOLE SEASON
+# (~50K PLAYS x ~370 COLUMNS). WE DOWNLOAD IT TO A TEMP FILE AND STREAM ONLY PBP_COLUMNS OUT OF IT
+# PBP_BATCH_ROWS PLAYS AT A TIME, SO ONLY ONE BATCH AND THE RUNNING TOTALS ARE EVER IN MEMORY
+PBP_URL = 'https://github.com/nflverse/nflverse-data/releases/download/pbp/play_by_play_{season}.parquet'
+PBP_BATCH_ROWS = int(os.getenv('PBP_BATCH_ROWS', 8192))
+PBP_COLUMNS = [
+    'season_type', 'week', 'posteam', 'play_type', 'two_point_attempt', 'yardline_100',
+    'receiver_player_id', 'rusher_player_id', 'complete_pass', 'air_yards'
+]
+RED_ZONE_YARDLINE = 20  # PLAYS SNAPPED AT OR INSIDE THE OPPONENT'S 20
+
+# PER (PLAYER, TEAM) COUNTS KEPT FROM THE PLAY-BY-PLAY, AND HOW BATCHES ARE COMBINED
+USAGE_FIELDS = ['targets', 'air_yards', 'red_zone_carries', 'red_zone_receptions']
+USAGE_AGGREGATIONS = dict({field: 'sum' for field in USAGE_FIELDS}, last_week='max')
+
+# STREAMING REDUCER: FOLD PLAY-BY-PLAY BATCHES INTO PER (PLAYER_ID, TEAM) TOTALS
+# EACH BATCH IS GROUPED ON ITS OWN AND MERGED INTO THE RUNNING TOTALS, WHICH NEVER HOLD MORE THAN
+# ONE ROW PER PLAYER PER TEAM (A FEW THOUSAND ROWS FOR A SEASON) NO MATTER HOW MANY PLAYS GO IN
+class UsageReducer:
+    def __init__(self):
+        self.totals = None
+
+    def add(self, plays):
+        plays = plays[
+            (plays['season_type'] == 'REG')
+            & plays['play_type'].isin(['pass', 'run'])
+            & (plays['two_point_attempt'].fillna(0) == 0)
+        ]
+        red_zone = plays['yardline_100'] <= RED_ZONE_YARDLINE
+        targeted = plays[(plays['play_type'] == 'pass') & plays['receiver_player_id'].notna()]
+        carries = plays[(plays['play_type'] == 'run') & plays['rusher_player_id'].notna()]
+
+        receiving = pd.DataFrame({
+            'player_id': targeted['receiver_player_id'],
+            'team': targeted['posteam'],
+            'targets': 1,
+            'air_yards': targeted['air_yards'].fillna(0),
+            'red_zone_carries': 0,
+            'red_zone_receptions': (red_zone[targeted.index] & (targeted['complete_pass'] == 1)).astype(int),
+            'last_week': targeted['week'],
+        })
+        rushing = pd.DataFrame({
+            'player_id': carries['rusher_player_id'],
+            'team': carries['posteam'],
+            'targets': 0,
+            'air_yards': 0.0,
+            'red_zone_carries': red_zone[carries.index].astype(int),
+            'red_zone_receptions': 0,
+            'last_week': carries['week'],
+        })
+        batch = pd.concat([receiving, rushing]).groupby(['player_id', 'team']).agg(USAGE_AGGREGATIONS)
+        if self.totals is not None:
+            batch = pd.concat([self.totals, batch]).groupby(level=['player_id', 'team']).agg(USAGE_AGGREGATIONS)
+        self.totals = batch
+
+    # THE COMPACT (PLAYER_ID, TEAM) FRAME A UsageStore IS BUILT FROM
+    def result(self):
+        if self.totals is None:
+            return pd.DataFrame(columns=['player_id', 'team'] + USAGE_FIELDS + ['last_week'])
+        frame = self.totals.reset_index()
+        for field in ['targets', 'red_zone_carries', 'red_zone_receptions', 'last_week']:
+            frame[field] = pd.to_numeric(frame[field], downcast='integer')
+        return frame.astype({'team': 'category', 'air_yards': 'float32'})
+
+# DOWNLOAD ONE SEASON OF PLAY-BY-PLAY AND REDUCE IT TO USAGE TOTALS (BLOCKING)
+def stream_pbp_usage(season):
+    reducer = UsageReducer()
+    with tempfile.TemporaryFile() as f:
+        with urllib.request.urlopen(PBP_URL.format(season=season), timeout=60) as response:
+            shutil.copyfileobj(response, f, 2**20)
+        f.seek(0)
+        for batch in pq.ParquetFile(f).iter_batches(batch_size=PBP_BATCH_ROWS, columns=PBP_COLUMNS):
+            reducer.add(batch.to_pandas())
+    return reducer.result()
+
+# ONE PLAYER'S SEASON USAGE, SUMMED OVER EVERY TEAM THEY PLAYED FOR
+UsageRecord = namedtuple('UsageRecord', ['targets', 'team_targets', 'air_yards', 'red_zone_carries', 'red_zone_receptions'])
+
+# PER-PLAYER USAGE METRICS FROM THE PLAY-BY-PLAY: TARGET SHARE, AIR YARDS AND RED-ZONE TOUCHES
+# frame IS UsageReducer.result() (OR A STORE'S OWN to_frame(), WHEN RESTORING A SNAPSHOT). A TEAM'S
+# TARGETS ARE THE SUM OF ITS PLAYERS' TARGETS, AND A PLAYER WHO CHANGED TEAMS IS MEASURED AGAINST THE
+# TARGETS OF EVERY TEAM THAT THREW TO THEM
+class UsageStore:
+    def __init__(self, frame):
+        self.frame = frame
+        self.last_week = int(frame['last_week'].max()) if len(frame) else 0
+        self.memory_bytes = int(frame.memory_usage(deep=True).sum())
+
+        team_targets = frame.groupby('team', observed=True)['targets'].sum()
+        per_team = frame.assign(
+            team_targets=frame['team'].map(team_targets).astype(float).where(frame['targets'] > 0, 0)
+        )
+        totals = per_team.groupby('player_id')[list(UsageRecord._fields)].sum()
+        self.rows = {player_id: UsageRecord(*values) for player_id, values in zip(totals.index, totals.itertuples(index=False))}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def get(self, player_id):
+        return self.rows.get(player_id)
+
+    def to_frame(self):
+        return self.frame
+
+# REGULAR SEASON LENGTH (17 GAMES SINCE 2021, 16 BEFORE THAT)
+def regular_season_games(season):
+    return 17 if season >= 2021 else 16
+
+# ERROR MESSAGE FOR A SEASON WE CAN'T SERVE (None IF THE SEASON IS FINE)
+def season_error(season):
+    latest = date.today().year
+    if season < FIRST_SEASON or season > latest:
+        return f"❌ Season must be between {FIRST_SEASON} and {latest}."
+    return None
+
+# EVERYTHING THE COMMANDS NEED FOR ONE SEASON, BUILT ONCE WHEN THE SEASON IS LOADED
+# A SeasonData IS NEVER MODIFIED AFTER IT IS BUILT - A REFRESH BUILDS A NEW ONE WITH A NEW VERSION
+# AND SWAPS IT INTO THE SEASON MANAGER, SO IN-FLIGHT COMMANDS KEEP A CONSISTENT SNAPSHOT
+class SeasonData:
+    # frame IS THE SEASONAL STATS FRAME ALREADY MERGED WITH PLAYER NAMES (IT IS COMPACTED HERE). WHEN
+    # previous IS GIVEN AND THE SET OF PLAYERS HASN'T CHANGED, ITS NAME AND AUTOCOMPLETE INDEXES ARE REUSED.
+    # usage IS A UsageStore, OR None WHEN THE SEASON'S PLAY-BY-PLAY COULDN'T BE LOADED.
+    # stat_arrays IS PASSED ON TO StatMatrix
+    def __init__(self, season, frame, weekly_store, roster_cache, player_ids, previous=None, usage=None, stat_arrays=None):
+        self.season = season
+        self.version = next(dataset_versions)
+        self.frame = frame = compact_season_frame(frame)
+        self.weekly_store = weekly_store
+        self.roster_cache = roster_cache
+        self.usage = usage
+        self.last_week = weekly_store.last_week
+        self.source = 'download'
+        self.snapshot_mtime = None  # WHEN RESTORED FROM A SNAPSHOT, THE mtime OF ITS season FILE
+        
+        # BUILD THE PER-PLAYER RECORD STORE USED BY THE LOOKUP COMMANDS
+        self.player_store = PlayerStore(frame)
+        
+        # PRECOMPUTE PER-GAME STATS AND SORTED ORDERINGS FOR /filterbystat
+        self.stat_matrix = StatMatrix(self.player_store, stat_arrays)
+        
+        same_players = (
+            previous is not None
+            and previous.player_store.records.keys() == self.player_store.records.keys()
+            and previous.weekly_store.player_names.keys() == weekly_store.player_names.keys()
+        )
+        if same_players:
+            self.name_index = previous.name_index
+            self.autocomplete = previous.autocomplete
+            self.player_labels = previous.player_labels
+        else:
+            # BUILD THE FUZZY-MATCH NAME INDEX ONCE FOR THIS DATASET
+            self.name_index = NameIndex(frame['name'], frame['player_id'])
+            
+            # BUILD THE AUTOCOMPLETE INDEX FROM PLAYER_IDS, LIMITED TO PLAYERS IN THIS SEASON
+            # AND RANKED BY FANTASY POINTS SO THE MOST RELEVANT PLAYERS ARE SUGGESTED FIRST
+            store = self.player_store
+            loaded = set(store.records) | set(weekly_store.player_names)
+            known = player_ids[player_ids['gsis_id'].isin(loaded) & player_ids['name'].notna()]
+            points = known['gsis_id'].map(
+                {player_id: record.fantasy_points_ppr for player_id, record in store.records.items()}
+            ).fillna(-1)
+            known = known.iloc[np.argsort(-points.to_numpy(), kind='stable')]
+            
+            # PLAYERS WHO SHARE A NAME GET A "Name (POS, TEAM)" LABEL TO TELL THEM APART
+            shared = known[known['name'].duplicated(keep=False)]
+            self.player_labels = dict(zip(shared['gsis_id'], player_labels(shared)))
+            shared_choices = {}
+            for player_id, name in zip(shared['gsis_id'], shared['name']):
+                shared_choices.setdefault(name, []).append((self.player_labels[player_id], player_id))
+            self.autocomplete = AutocompleteIndex(known['name'], shared_choices)
+        
+        # ROUGH FOOTPRINT USED FOR THE SEASON MEMORY BUDGET AND /memoryreport: THE COMPACTED
+        # FRAMES' DEEP SIZE PLUS THE STAT MATRIX (THE NAME INDEXES AREN'T COUNTED)
+        self.memory_breakdown = {
+            'season stats': int(frame.memory_usage(deep=True).sum()),
+            'weekly stats': weekly_store.memory_bytes,
+            'rosters': roster_cache.memory_bytes,
+            'stat matrix': self.stat_matrix.memory_bytes,
+            'usage': usage.memory_bytes if usage else 0,
+        }
+        self.memory_bytes = sum(self.memory_breakdown.values())
+
+    # THE SAME SEASON WITH PLAY-BY-PLAY USAGE ATTACHED. EVERYTHING ELSE IS SHARED, BUT IT GETS A NEW
+    # VERSION SO RESPONSES RENDERED WITHOUT THE USAGE LINES DROP OUT OF THE RESPONSE CACHE
+    def with_usage(self, usage):
+        data = copy.copy(self)
+        data.version = next(dataset_versions)
+        data.usage = usage
+        data.memory_breakdown = dict(self.memory_breakdown, usage=usage.memory_bytes)
+        data.memory_bytes = sum(data.memory_breakdown.values())
+        return data
+
+# COLUMNS KEPT FROM THE PLAYER ID TABLE - import_ids RETURNS DOZENS OF OTHER SITES' IDS WE NEVER READ
+PLAYER_ID_COLUMNS = ['gsis_id', 'name', 'position', 'team']
+
+# team ONLY LABELS PLAYERS WHO SHARE A NAME, SO AN OLDER ids SNAPSHOT WITHOUT IT STILL WORKS
+def compact_player_ids(ids):
+    return ids.loc[ids['gsis_id'].notna(), [col for col in PLAYER_ID_COLUMNS if col in ids.columns]].reset_index(drop=True)
+
+# "Name (POS, TEAM)" FOR EACH ROW OF A player_ids FRAME, WITH THE PLAYER_ID ADDED WHERE THAT STILL REPEATS
+def player_labels(player_ids):
+    details = [player_ids[col].astype(object).where(player_ids[col].notna(), None) for col in ['position', 'team'] if col in player_ids.columns]
+    labels = [
+        f"{name} ({', '.join(str(part) for part in parts if part)})" if any(parts) else name
+        for name, *parts in zip(player_ids['name'], *details)
+    ]
+    counts = Counter(labels)
+    return [
+        label if counts[label] == 1 else f"{label} [{player_id}]"
+        for label, player_id in zip(labels, player_ids['gsis_id'])
+    ]
+
+# LOAD-TIME COMPACTION OF A MERGED SEASON FRAME
+# import_seasonal_data RETURNS ~60 COLUMNS BUT THE COMMANDS ONLY READ PLAYER_STAT_FIELDS, SO WE KEEP
+# player_id + name + ONE RESOLVED position (DROPPING position_x/position_y AND gsis_id), STORE NAME AND
+# POSITION AS CATEGORICALS AND SHRINK EACH COUNTING STAT TO THE SMALLEST INTEGER TYPE THAT HOLDS IT
+# (FRACTIONAL COLUMNS LIKE FANTASY POINTS STAY float64 SO AVERAGES DON'T CHANGE)
+def compact_season_frame(frame):
+    positions = pd.Series('N/A', index=frame.index, dtype=object)
+    for col in ['position', 'position_x', 'position_y']:
+        if col in frame.columns:
+            positions = frame[col].astype(object).where(frame[col].notna(), positions)
+    
+    compact = pd.DataFrame({
+        'player_id': frame['player_id'].astype(object),
+        'name': frame['name'].astype('category'),
+        'position': positions.astype('category'),
+    })
+    for field in PLAYER_STAT_FIELDS:
+        values = frame[field].fillna(0) if field in frame.columns else pd.Series(0, index=frame.index)
+        compact[field] = pd.to_numeric(values, downcast='integer')
+    return compact.reset_index(drop=True)
+
+# MERGE PLAYER NAMES WITH SEASONAL STATS
+def merge_player_names(seasonal, player_ids):
+    return seasonal.merge(
+        player_ids[['gsis_id', 'name', 'position']],
+        left_on='player_id',
+        right_on='gsis_id',
+        how='left'
+    )
+
+# BUILD A SeasonData FROM FRESHLY DOWNLOADED FRAMES
+def build_season_data(season, seasonal, weekly, rosters, player_ids, usage=None):
+    return SeasonData(
+        season,
+        merge_player_names(seasonal, player_ids),
+        WeeklyStatsStore(merge_weekly_names(weekly, player_ids)),
+        RosterCache(merge_roster_names(rosters, player_ids)),
+        player_ids,
+        usage=usage
+    )
+
+# ADD NEW REGULAR-SEASON WEEKS ONTO SEASON TOTALS WITHOUT TOUCHING THE ORIGINAL FRAME
+# ONLY THE COUNTING STATS THE COMMANDS READ (PLAYER_STAT_FIELDS) ARE ROLLED FORWARD
+def roll_forward_totals(frame, new_weeks, player_ids):
+    if 'season_type' in new_weeks.columns:
+        new_weeks = new_weeks[new_weeks['season_type'] == 'REG']
+    if new_weeks.empty:
+        return frame
+    
+    fields = [f for f in PLAYER_STAT_FIELDS if f != 'games' and f in new_weeks.columns]
+    grouped = new_weeks.groupby('player_id')
+    added = grouped[fields].sum()
+    added['games'] = grouped.size()
+    
+    totals = frame.set_index('player_id')
+    
+    # PLAYERS APPEARING FOR THE FIRST TIME THIS SEASON GET A NEW ROW
+    new_ids = added.index.difference(totals.index)
+    if len(new_ids):
+        newcomers = merge_player_names(pd.DataFrame({'player_id': new_ids}), player_ids).set_index('player_id')
+        totals = pd.concat([totals, newcomers])
+    
+    for field in added.columns:
+        current = totals[field] if field in totals.columns else pd.Series(0, index=totals.index)
+        totals[field] = current.fillna(0).add(added[field], fill_value=0)
+    
+    return totals.reset_index()
+
+# BUILD THE NEXT VERSION OF A SEASON FROM A FRESH WEEKLY DOWNLOAD, USING ONLY WEEKS WE HAVEN'T SEEN,
+# AND (WHEN GIVEN) A NEWER UsageStore. RETURNS None WHEN THERE IS NOTHING NEW
+def extend_season_data(data, weekly, player_ids):
+    new_weeks = weekly[weekly['week'] > data.last_week]
+    if new_weeks.empty:
+        return None
+    
+    return SeasonData(
+        data.season,
+        roll_forward_totals(data.frame, new_weeks, player_ids),
+        WeeklyStatsStore(merge_weekly_names(new_weeks, player_ids), base=data.weekly_store),
+        data.roster_cache,
+        player_ids,
+        previous=data,
+        usage=data.usage
+    )
+
+# LATEST REGULAR-SEASON WEEK IN A WEEKLY DOWNLOAD (0 IF THERE ISN'T ONE YET)
+def last_regular_week(weekly):
+    if 'season_type' in weekly.columns:
+        weekly = weekly[weekly['season_type'] == 'REG']
+    return int(weekly['week'].max()) if len(weekly) else 0
+
+# SINGLE-FLIGHT: CONCURRENT CALLS WITH THE SAME KEY SHARE ONE EXECUTION (BLOCKING - WORKER THREADS)
+# THE FIRST CALLER RUNS func AND EVERY CALLER THAT ARRIVES WHILE IT IS RUNNING GETS THE SAME RESULT,
+# OR THE SAME EXCEPTION. NOTHING IS KEPT AFTERWARDS - THE NEXT CALL FOR THAT KEY RUNS func AGAIN
+class SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, func, *args):
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = self.calls[key] = Future()
+        if not leader:
+            return future.result()
+        
+        try:
+            result = func(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                del self.calls[key]
+
+# DATASET FETCH SETTINGS - A FAILED DOWNLOAD IS RETRIED FETCH_RETRIES TIMES, WAITING
+# FETCH_BACKOFF_SECONDS, THEN TWICE THAT, AND SO ON (WITH JITTER) BETWEEN ATTEMPTS
+FETCH_RETRIES = int(os.getenv('FETCH_RETRIES', 3))
+FETCH_BACKOFF_SECONDS = float(os.getenv('FETCH_BACKOFF_SECONDS', 2))
+
+# EVERY nfl_data_py DOWNLOAD THE BOT MAKES, BY DATASET NAME
+DATASET_FETCHERS = {
+    'ids': lambda season: nfl.import_ids(),
+    'seasonal': lambda season: nfl.import_seasonal_data([season]),
+    'weekly': lambda season: nfl.import_weekly_data([season]),
+    'rosters': lambda season: nfl.import_seasonal_rosters([season]),
+    'usage': stream_pbp_usage,
+}
+
+dataset_fetches = SingleFlight()
+
+def fetch_with_retries(dataset, season):
+    for attempt in range(FETCH_RETRIES + 1):
+        try:
+            return DATASET_FETCHERS[dataset](season)
+        except Exception as e:
+            if attempt == FETCH_RETRIES:
+                raise
+            delay = FETCH_BACKOFF_SECONDS * 2 ** attempt * random.uniform(0.5, 1.5)
+            print(f"Fetching {dataset} data for {season} failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+# DOWNLOAD ONE DATASET (BLOCKING). CONCURRENT REQUESTS FOR THE SAME (DATASET, SEASON) SHARE ONE
+# IN-FLIGHT DOWNLOAD, SO CALLERS GET THE SAME FRAME AND MUST NOT MODIFY IT
+def fetch_dataset(dataset, season=None):
+    return dataset_fetches.do((dataset, season), fetch_with_retries, dataset, season)
+
+# PLAY-BY-PLAY USAGE FOR A SEASON (BLOCKING). USAGE IS AN EXTRA, SO A FAILED DOWNLOAD ONLY LOSES
+# THOSE LINES - THE SEASON ITSELF STILL LOADS, AND THE NEXT REFRESH TRIES AGAIN
+def load_usage(season):
+    start = time.perf_counter()
+    try:
+        usage = UsageStore(fetch_dataset('usage', season))
+    except Exception as e:
+        print(f"Play-by-play usage for {season} is unavailable: {e}")
+        return None
+    metrics.observe(('dataset', 'usage'), time.perf_counter() - start)
+    print(f"Reduced {season} play-by-play to usage for {len(usage)} players through week {usage.last_week}")
+    return usage
+
+# LAZY PER-SEASON LOADER WITH LRU EVICTION UNDER A MEMORY BUDGET
+# A SEASON IS DOWNLOADED THE FIRST TIME SOMEONE ASKS FOR IT; PINNED SEASONS ARE NEVER EVICTED.
+# after_load (IF GIVEN) IS CALLED WITH EACH SEASON THE MANAGER LOADS, ONCE IT IS IN PLACE
+class SeasonDataManager:
+    def __init__(self, loader, memory_budget_bytes, pinned=(), after_load=None):
+        self.loader = loader
+        self.after_load = after_load
+        self.memory_budget_bytes = memory_budget_bytes
+        self.pinned = set(pinned)
+        self.seasons = OrderedDict()
+        self.lock = threading.Lock()
+        self.loads = SingleFlight()
+
+    def __len__(self):
+        return len(self.seasons)
+
+    def loaded(self):
+        return list(self.seasons)
+
+    def memory_bytes(self):
+        return sum(data.memory_bytes for data in list(self.seasons.values()))
+
+    # RETURN A SEASON ONLY IF IT IS ALREADY IN MEMORY (NEVER LOADS)
+    # touch=True ALSO MARKS IT AS RECENTLY USED FOR EVICTION PURPOSES
+    def peek(self, season, touch=False):
+        if touch:
+            with self.lock:
+                data = self.seasons.get(season)
+                if data is not None:
+                    self.seasons.move_to_end(season)
+                return data
+        return self.seasons.get(season)
+
+    # RETURN A SEASON, LOADING IT ON FIRST USE (BLOCKING - CALL FROM THE WORKER POOL)
+    def get(self, season):
+        with self.lock:
+            data = self.seasons.get(season)
+            if data is not None:
+                self.seasons.move_to_end(season)
+                return data
+        
+        # ONLY ONE THREAD LOADS A GIVEN SEASON, ANY OTHERS WAIT AND SHARE ITS RESULT (OR ITS ERROR)
+        return self.loads.do(season, self.load, season)
+
+    def load(self, season):
+        data = self.peek(season)
+        if data is None:
+            data = self.loader(season)
+            self.put(data)
+            if self.after_load is not None:
+                self.after_load(data)
+        return data
+
+    # SWAP IN A NEW VERSION OF A SEASON, UNLESS current WAS REPLACED OR EVICTED IN THE MEANTIME
+    def replace(self, current, data):
+        with self.lock:
+            if self.seasons.get(data.season) is not current:
+                return False
+            self.seasons[data.season] = data
+            return True
+
+    def put(self, data):
+        with self.lock:
+            self.seasons[data.season] = data
+            self.seasons.move_to_end(data.season)
+            
+            # EVICT LEAST RECENTLY USED SEASONS UNTIL WE ARE BACK UNDER BUDGET
+            while self.memory_bytes() > self.memory_budget_bytes:
+                victim = next(
+                    (season for season in self.seasons if season not in self.pinned and season != data.season),
+                    None
+                )
+                if victim is None:
+                    break
+                evicted = self.seasons.pop(victim)
+                
+                # CACHED RESPONSES (PAGED ONES ESPECIALLY) HOLD ON TO THE SEASON'S STAT MATRIX - DROP THEM
+                # TOO, OR THE EVICTED SEASON WOULD STAY IN MEMORY REGARDLESS OF THE BUDGET
+                response_cache.invalidate_version(evicted.version)
+                print(f"Evicted {victim} season data (memory budget {self.memory_budget_bytes // 2**20} MB)")
+
+# LOCAL SNAPSHOTS OF THE MERGED, COMPACTED FRAMES, ONE FEATHER FILE PER FRAME, PLUS THE LARGEST
+# DERIVED NUMERIC ARRAYS AS .npy FILES:
+#   snapshots/v3/ids.feather
+#   snapshots/v3/<season>/{season,weekly,rosters}.feather
+#   snapshots/v3/<season>/usage.feather        ONLY WHEN THE PLAY-BY-PLAY WAS AVAILABLE
+#   snapshots/v3/<season>/trends-<fingerprint>.npy           WeeklyStatsStore.to_cumulative()
+#   snapshots/v3/<season>/stat_{values,percentiles}-<fingerprint>.npy   THE StatMatrix ARRAYS
+#   (SEE season_arrays FOR WHAT THE FINGERPRINTS COVER)
+# BOTH ARE READ THROUGH MEMORY MAPS, SO A RESTART RESTORES A SEASON IN MILLISECONDS INSTEAD OF
+# RE-DOWNLOADING IT, AND PROCESSES MAPPING THE SAME FILES SHARE ONE COPY OF THEM IN THE PAGE CACHE.
+# BUMP SNAPSHOT_FORMAT WHENEVER THE LAYOUT OF THOSE FRAMES OR ARRAYS CHANGES (STAT_REGISTRY AND
+# TREND_FIELDS INCLUDED)
+SNAPSHOT_FORMAT = 3
+SNAPSHOT_FRAMES = ['season', 'weekly', 'rosters']
+
+def snapshot_path(*parts):
+    return os.path.join(SNAPSHOT_DIR, f'v{SNAPSHOT_FORMAT}', *map(str, parts))
+
+# A SEASON SNAPSHOT WRITTEN AFTER THAT SEASON ENDED (THE SUPER BOWL IS IN FEBRUARY) NEVER GOES STALE.
+# ANYTHING ELSE (THE PLAYER ID TABLE, THE CURRENT SEASON) IS ONLY TRUSTED FOR SNAPSHOT_MAX_AGE_HOURS -
+# EXCEPT IN A SHARD WORKER, WHOSE SUPERVISOR KEEPS THOSE SNAPSHOTS CURRENT
+def snapshot_is_fresh(path, season=None):
+    if not os.path.exists(path):
+        return False
+    if SHARD_WORKER:
+        return True
+    written = os.path.getmtime(path)
+    if season is not None and date.fromtimestamp(written) >= date(season + 1, 3, 1):
+        return True
+    return time.time() - written < SNAPSHOT_MAX_AGE_HOURS * 3600
+
+# WRITE TO A TEMP FILE AND RENAME, SO A CRASH MID-WRITE NEVER LEAVES A TRUNCATED SNAPSHOT BEHIND
+# (THE TEMP FILE IS UNIQUE TO EACH WRITE - SHARD WORKERS AND THREADS MAY SNAPSHOT THE SAME SEASON AT
+# ONCE). A PROCESS STILL MAPPING THE OLD FILE KEEPS READING IT UNTIL IT RELOADS
+def write_file(path, write):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as sink:
+            write(sink)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+# UNCOMPRESSED AND ONE CHUNK PER COLUMN, SO A READER CAN USE THE COLUMNS STRAIGHT OUT OF THE MAP
+def write_frame(frame, path):
+    write_file(path, lambda sink: feather.write_feather(
+        frame.reset_index(drop=True), sink, compression='uncompressed', chunksize=max(len(frame), 1)
+    ))
+
+# NUMERIC COLUMNS WITHOUT NULLS COME BACK AS READ-ONLY VIEWS OF THE MAPPED FILE, NOT COPIES
+# (split_blocks KEEPS PANDAS FROM CONSOLIDATING THEM INTO ONE NEW BLOCK); STRINGS ARE STILL DECODED
+def read_frame(path):
+    return feather.read_table(path, memory_map=True).to_pandas(split_blocks=True)
+
+def write_array(array, path):
+    write_file(path, lambda sink: np.save(sink, np.ascontiguousarray(array)))
+
+# A READ-ONLY VIEW OF THE MAPPED FILE
+def read_array(path):
+    return np.load(path, mmap_mode='r').view(np.ndarray)
+
+# CONTENT FINGERPRINT OF THE FRAME COLUMNS A DERIVED ARRAY IS BUILT FROM, PLUS ANYTHING ELSE THAT SHAPES
+# IT (extra). LABELS ARE HASHED AS STRINGS AND NUMBERS AS FLOAT64, SO THE SAME DATA FINGERPRINTS THE
+# SAME WHETHER ITS COLUMNS ARE CATEGORICAL, DOWNCAST OR FRESHLY READ BACK FROM A FILE
+def frame_fingerprint(frame, labels, numbers, *extra):
+    digest = hashlib.sha256(repr((labels, numbers) + extra).encode())
+    for col in labels:
+        digest.update(pd.util.hash_array(frame[col].astype(str).to_numpy(dtype=object)).tobytes())
+    # COLUMN BY COLUMN - SELECTING SEVERAL AT ONCE WOULD MAKE PANDAS CONSOLIDATE (COPY) MAPPED COLUMNS
+    for col in numbers:
+        values = frame[col].to_numpy(dtype=np.float64) if col in frame.columns else np.full(len(frame), np.nan)
+        digest.update(values.tobytes())
+    return digest.hexdigest()[:16]
+
+# THE DERIVED ARRAYS SAVED ALONGSIDE A SEASON'S FRAMES, BY FILE NAME. EACH NAME CARRIES THE FINGERPRINT
+# OF THE FRAME IT WAS BUILT FROM (THE COMPACTED SEASON FRAME FOR THE STAT MATRIX, THE WEEKLY STORE'S FRAME
+# FOR THE TRENDS), SO A READER ONLY EVER FINDS ARRAYS THAT MATCH THE FRAMES IT ACTUALLY READ - EVEN IF
+# A WRITE WAS INTERRUPTED OR RACED ANOTHER ONE
+def stat_fingerprint(frame):
+    return frame_fingerprint(frame, ['player_id', 'name', 'position'], PLAYER_STAT_FIELDS, list(STAT_REGISTRY), MIN_GAMES)
+
+def trend_fingerprint(frame):
+    return frame_fingerprint(frame, ['player_id'], ['week'] + TREND_FIELDS)
+
+def season_arrays(data):
+    stats = stat_fingerprint(data.frame)
+    trends = trend_fingerprint(data.weekly_store.frame)
+    return {
+        f'trends-{trends}.npy': data.weekly_store.to_cumulative(),
+        f'stat_values-{stats}.npy': data.stat_matrix.values,
+        f'stat_percentiles-{stats}.npy': data.stat_matrix.percentiles,
+    }
+
+# BUILD A SeasonData FROM SAVED FRAMES (A SNAPSHOT OR A DATA PACK), REUSING THE SAVED ARRAYS THAT MATCH
+# THEM. read_saved_array(name) RETURNS THE ARRAY SAVED UNDER name, OR None IF THERE ISN'T ONE
+def restore_season_data(season, frames, ids, usage, read_saved_array):
+    frame = compact_season_frame(frames['season'])
+    stats = stat_fingerprint(frame)
+    stat_arrays = (read_saved_array(f'stat_values-{stats}.npy'), read_saved_array(f'stat_percentiles-{stats}.npy'))
+    return SeasonData(
+        season, frame,
+        WeeklyStatsStore(frames['weekly'], cumulative=read_saved_array(f'trends-{trend_fingerprint(frames["weekly"])}.npy')),
+        RosterCache(frames['rosters']), ids,
+        usage=usage, stat_arrays=stat_arrays if all(array is not None for array in stat_arrays) else None
+    )
+
+# ONE LOCK PER SEASON AROUND WRITING ITS SNAPSHOT, SO TWO THREADS (E.G. A REFRESH AND attach_usage)
+# NEVER INTERLEAVE THEIR FILES
+snapshot_locks = {}
+snapshot_locks_guard = threading.Lock()
+
+def snapshot_lock(season):
+    with snapshot_locks_guard:
+        return snapshot_locks.setdefault(season, threading.Lock())
+
+def save_ids_snapshot(ids):
+    if not SNAPSHOT_DIR:
+        return
+    try:
+        write_frame(ids, snapshot_path('ids.feather'))
+    except Exception as e:
+        print(f"Failed to write player ID snapshot: {e}")
+
+# PLAYER ID TABLE FROM THE SNAPSHOT (None IF MISSING OR STALE)
+def load_ids_snapshot():
+    path = snapshot_path('ids.feather')
+    if not SNAPSHOT_DIR or not snapshot_is_fresh(path):
+        return None
+    try:
+        return read_frame(path)
+    except Exception as e:
+        print(f"Failed to read player ID snapshot: {e}")
+        return None
+
+def save_season_snapshot(data):
+    if not SNAPSHOT_DIR:
+        return
+    try:
+        with snapshot_lock(data.season):
+            # ANOTHER VERSION OF THE SEASON ALREADY REPLACED THIS ONE - IT WRITES ITS OWN SNAPSHOT
+            current = seasons.peek(data.season) if seasons is not None else None
+            if current is not None and current is not data:
+                return
+            
+            # THE season FRAME IS WRITTEN LAST - IT MARKS THE SNAPSHOT AS COMPLETE AND CARRIES ITS TIMESTAMP.
+            # ARRAYS LEFT OVER FROM EARLIER VERSIONS ARE REMOVED ONCE IT IS IN PLACE
+            usage_path = snapshot_path(data.season, 'usage.feather')
+            if data.usage is not None:
+                write_frame(data.usage.to_frame(), usage_path)
+            elif os.path.exists(usage_path):
+                os.remove(usage_path)
+            write_frame(data.weekly_store.to_frame(), snapshot_path(data.season, 'weekly.feather'))
+            arrays = season_arrays(data)
+            for name, array in arrays.items():
+                write_array(array, snapshot_path(data.season, name))
+            write_frame(data.roster_cache.to_frame(), snapshot_path(data.season, 'rosters.feather'))
+            write_frame(data.frame, snapshot_path(data.season, 'season.feather'))
+            
+            for name in os.listdir(snapshot_path(data.season)):
+                if name.endswith('.npy') and name not in arrays:
+                    os.remove(snapshot_path(data.season, name))
+    except Exception as e:
+        print(f"Failed to write {data.season} snapshot: {e}")
+
+# REBUILD A SeasonData FROM ITS SNAPSHOT (None IF MISSING OR STALE)
+def load_season_snapshot(season, ids):
+    paths = {name: snapshot_path(season, f'{name}.feather') for name in SNAPSHOT_FRAMES}
+    if not SNAPSHOT_DIR or not snapshot_is_fresh(paths['season'], season):
+        return None
+    try:
+        start = time.perf_counter()
+        mtime = os.path.getmtime(paths['season'])
+        frames = {name: read_frame(path) for name, path in paths.items()}
+        usage_path = snapshot_path(season, 'usage.feather')
+        usage = UsageStore(read_frame(usage_path)) if os.path.exists(usage_path) else None
+        
+        # AN ARRAY THAT IS MISSING (OR WAS JUST REPLACED BY A NEWER VERSION'S) IS SIMPLY REBUILT
+        def read_saved_array(name):
+            try:
+                return read_array(snapshot_path(season, name))
+            except FileNotFoundError:
+                return None
+        
+        data = restore_season_data(season, frames, ids, usage, read_saved_array)
+        data.source = 'snapshot'
+        data.snapshot_mtime = mtime
+        metrics.observe(('dataset', 'snapshot'), time.perf_counter() - start)
+        print(f"Restored {season} from snapshot in {time.perf_counter() - start:.2f}s")
+        return data
+    except Exception as e:
+        print(f"Failed to read {season} snapshot: {e}")
+        return None
+
+# DATA PACKS (BUILT OFFLINE BY build_pack.py) ARE ONE UNCOMPRESSED TAR HOLDING:
+#   manifest.json                         FORMAT, PACK VERSION, SEASONS AND A SHA-256 PER MEMBER
+#   ids.feather                           THE COMPACTED PLAYER ID TABLE
+#   <season>/{season,weekly,rosters}.feather   THE SAME FRAMES AS A LOCAL SNAPSHOT
+#   <season>/usage.feather                PLAY-BY-PLAY USAGE, WHEN IT WAS AVAILABLE AT BUILD TIME
+#   <season>/*-<fingerprint>.npy          THE PRECOMPUTED STAT MATRIX AND TREND TOTALS (SEE season_arrays)
+# MEMBERS ARE READ STRAIGHT OUT OF A MEMORY MAP OF THE TAR AND CHECKED AGAINST THE MANIFEST
+DATA_PACK_FORMAT = 2
+
+class DataPackError(Exception):
+    pass
+
+class DataPack:
+    def __init__(self, path):
+        self.path = path
+        with tarfile.open(path, 'r:') as tar:
+            self.members = {member.name: (member.offset_data, member.size) for member in tar if member.isfile()}
+        # ZERO-COPY VIEW OF THE WHOLE FILE - SLICING IT IS SAFE FROM ANY WORKER THREAD
+        self.buffer = pa.memory_map(path).read_buffer()
+        
+        self.manifest = json.loads(self.read_member('manifest.json').to_pybytes())
+        if self.manifest.get('format') != DATA_PACK_FORMAT:
+            raise DataPackError(f"{path} is pack format {self.manifest.get('format')}, expected {DATA_PACK_FORMAT}")
+        self.version = self.manifest['version']
+        self.seasons = set(self.manifest['seasons'])
+
+    def read_member(self, name):
+        if name not in self.members:
+            raise DataPackError(f"{self.path} has no {name}")
+        offset, size = self.members[name]
+        return self.buffer.slice(offset, size)
+
+    def read_checked(self, name):
+        buffer = self.read_member(name)
+        if hashlib.sha256(buffer).hexdigest() != self.manifest['files'].get(name):
+            raise DataPackError(f"Checksum mismatch for {name} in {self.path}")
+        return buffer
+
+    def read_frame(self, name):
+        return feather.read_table(pa.BufferReader(self.read_checked(name))).to_pandas(split_blocks=True)
+
+    # AN .npy MEMBER AS A READ-ONLY ARRAY OVER THE MAPPED PACK (NO COPY)
+    def read_array(self, name):
+        buffer = self.read_checked(name)
+        reader = pa.BufferReader(buffer)
+        version = np.lib.format.read_magic(reader)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(reader)
+        array = np.frombuffer(buffer, dtype=dtype, count=int(np.prod(shape)), offset=reader.tell())
+        return array.reshape(shape, order='F' if fortran_order else 'C')
+
+    def load_ids(self):
+        return self.read_frame('ids.feather')
+
+    def load_season(self, season, ids):
+        frames = {name: self.read_frame(f'{season}/{name}.feather') for name in SNAPSHOT_FRAMES}
+        usage_member = f'{season}/usage.feather'
+        usage = UsageStore(self.read_frame(usage_member)) if usage_member in self.members else None
+        data = restore_season_data(
+            season, frames, ids, usage,
+            lambda name: self.read_array(f'{season}/{name}') if f'{season}/{name}' in self.members else None
+        )
+        data.source = 'pack'
+        return data
+
+# LOAD ONE SEASON (BLOCKING) - FROM THE DATA PACK IF IT HAS THE SEASON, THEN FROM A FRESH LOCAL
+# SNAPSHOT, OTHERWISE DOWNLOAD IT. SHARD WORKERS TAKE THE DEFAULT SEASON FROM THE SNAPSHOT THEIR
+# SUPERVISOR KEEPS UP TO DATE, SINCE THE PACK'S COPY MAY BE MISSING THE LATEST WEEKS
+def load_season(season, ids, pack=None):
+    if pack is not None and season in pack.seasons and not (SHARD_WORKER and season == DEFAULT_SEASON):
+        start = time.perf_counter()
+        data = pack.load_season(season, ids)
+        metrics.observe(('dataset', 'pack'), time.perf_counter() - start)
+        print(f"Loaded {season} from data pack {pack.version} in {time.perf_counter() - start:.2f}s")
+        return data
+    
+    data = load_season_snapshot(season, ids)
+    if data is not None:
+        return data
+    
+    print(f"Loading {season} NFL season data...")
+    start = time.perf_counter()
+    
+    print("Loading seasonal stats...")
+    seasonal = fetch_dataset('seasonal', season)
+    
+    print("Loading weekly stats...")
+    weekly = fetch_dataset('weekly', season)
+    
+    print("Loading rosters...")
+    rosters = fetch_dataset('rosters', season)
+    
+    # PLAY-BY-PLAY USAGE IS ATTACHED LATER BY attach_usage
+    data = build_season_data(season, seasonal, weekly, rosters, ids)
+    metrics.observe(('dataset', 'load'), time.perf_counter() - start)
+    print(
+        f"Loaded {season}: {len(data.player_store)} players, {len(data.weekly_store)} player-weeks, "
+        f"{len(data.roster_cache)} team rosters (~{data.memory_bytes // 2**20} MB)"
+    )
+    save_season_snapshot(data)
+    return data
+
+# PLAY-BY-PLAY USAGE IS STREAMED AFTER A SEASON IS ALREADY SERVING COMMANDS, ON ITS OWN THREAD, SO A
+# SLOW OR FAILING DOWNLOAD (AND ITS RETRIES) NEVER HOLDS UP A LOAD OR TAKES A WORKER POOL SLOT
+usage_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='nflstatsnap-usage')
+usage_pending = set()
+usage_pending_lock = threading.Lock()
+
+# QUEUE A PLAY-BY-PLAY STREAM FOR A SEASON, UNLESS ONE IS ALREADY QUEUED OR RUNNING
+def queue_usage(season):
+    with usage_pending_lock:
+        if season in usage_pending:
+            return
+        usage_pending.add(season)
+    usage_loader.submit(attach_usage, season)
+
+def schedule_usage(data):
+    # A SHARD WORKER GETS THE CURRENT SEASON'S USAGE FROM ITS SUPERVISOR'S SNAPSHOT
+    if data.usage is None and not (SHARD_WORKER and data.season == DEFAULT_SEASON):
+        queue_usage(data.season)
+
+def attach_usage(season):
+    try:
+        usage = load_usage(season)
+    finally:
+        with usage_pending_lock:
+            usage_pending.discard(season)
+    if usage is None:
+        return
+    
+    # ATTACH TO WHATEVER VERSION OF THE SEASON IS LOADED NOW, UNLESS IT WAS EVICTED OR ALREADY HAS
+    # USAGE THAT IS AT LEAST AS RECENT
+    data = seasons.peek(season)
+    if data is None or (data.usage is not None and data.usage.last_week >= usage.last_week):
+        return
+    attached = data.with_usage(usage)
+    if not seasons.replace(data, attached):
+        return
+    response_cache.invalidate_version(data.version)
+    print(f"Attached play-by-play usage to {season} (version {attached.version})")
+    save_season_snapshot(attached)
+
+# RESPONSE CACHE SETTINGS
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 2048))
+
+# CACHE OF RENDERED COMMAND RESPONSES
+# KEYS ARE (COMMAND, DATASET VERSION, NORMALIZED ARGS...), SO A REFRESHED DATASET NEVER SERVES STALE TEXT
+class ResponseCache(LRUCache):
+    # DROP EVERY ENTRY RENDERED FROM A GIVEN DATASET VERSION (CALLED WHEN THAT VERSION IS REPLACED)
+    def invalidate_version(self, version):
+        with self.lock:
+            for key in [key for key in self.entries if key[1] == version]:
+                del self.entries[key]
+
+response_cache = ResponseCache(RESPONSE_CACHE_SIZE)
+
+# METRICS SETTINGS - SET METRICS_PORT=0 TO TURN THE /metrics ENDPOINT OFF
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', 9108))
+
+# LATENCY HISTOGRAM BUCKET BOUNDS, IN SECONDS
+LATENCY_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 120.0]
+
+# PROMETHEUS-STYLE HISTOGRAM, PLUS THE MOST RECENT SAMPLES FOR EXACT PERCENTILES IN /botstats
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=1024)
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        self.recent.append(seconds)
+
+    def percentile(self, pct):
+        samples = sorted(self.recent)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+    def prometheus_lines(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ['+Inf'], self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {self.total}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+# OUTCOMES A COMMAND'S LATENCY IS RECORDED UNDER: ANSWERED, TURNED AWAY (QUEUE FULL / STILL LOADING), FAILED
+COMMAND_OUTCOMES = ['ok', 'busy', 'error']
+
+# TIMES ONE COMMAND INVOCATION; EACH mark() RECORDS THE TIME SINCE THE PREVIOUS MARK AS A STAGE
+# HANDLERS SET outcome WHEN THEY TURN A REQUEST AWAY OR FAIL, AND CALL finish() FROM A finally BLOCK
+class StageClock:
+    def __init__(self, metrics, command):
+        self.metrics = metrics
+        self.command = command
+        self.outcome = 'ok'
+        self.start = self.last = time.perf_counter()
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.metrics.observe(('stage', self.command, stage), now - self.last)
+        self.last = now
+
+    def finish(self):
+        self.metrics.observe(('command', self.command, self.outcome), time.perf_counter() - self.start)
+
+# IN-PROCESS METRICS RECORDER: COMMAND LATENCY, PER-STAGE TIMINGS AND DATASET LOAD/REFRESH DURATIONS
+class Metrics:
+    def __init__(self):
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def observe(self, key, seconds):
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def clock(self, command):
+        return StageClock(self, command)
+
+    def snapshot(self, kind):
+        with self.lock:
+            return sorted((key, hist) for key, hist in self.histograms.items() if key[0] == kind)
+
+    # RENDER EVERYTHING IN THE PROMETHEUS TEXT EXPOSITION FORMAT
+    def render_prometheus(self):
+        lines = [
+            '# HELP nflstatsnap_command_seconds End-to-end slash command latency.',
+            '# TYPE nflstatsnap_command_seconds histogram',
+        ]
+        commands_seen = self.snapshot('command')
+        for (_, command, outcome), hist in commands_seen:
+            lines += hist.prometheus_lines('nflstatsnap_command_seconds', f'command="{command}",outcome="{outcome}"')
+        lines += [
+            '# HELP nflstatsnap_command_rejections_total Commands turned away as busy or failed with an error.',
+            '# TYPE nflstatsnap_command_rejections_total counter',
+        ]
+        for (_, command, outcome), hist in commands_seen:
+            if outcome != 'ok':
+                lines.append(f'nflstatsnap_command_rejections_total{{command="{command}",outcome="{outcome}"}} {hist.count}')
+        lines += [
+            '# HELP nflstatsnap_stage_seconds Time spent in each stage of a slash command.',
+            '# TYPE nflstatsnap_stage_seconds histogram',
+        ]
+        for (_, command, stage), hist in self.snapshot('stage'):
+            lines += hist.prometheus_lines('nflstatsnap_stage_seconds', f'command="{command}",stage="{stage}"')
+        lines += [
+            '# HELP nflstatsnap_dataset_seconds Dataset load and refresh durations.',
+            '# TYPE nflstatsnap_dataset_seconds histogram',
+        ]
+        for (_, kind), hist in self.snapshot('dataset'):
+            lines += hist.prometheus_lines('nflstatsnap_dataset_seconds', f'kind="{kind}"')
+        
+        lines += [
+            '# HELP nflstatsnap_response_cache_hits_total Response cache hits.',
+            '# TYPE nflstatsnap_response_cache_hits_total counter',
+            f'nflstatsnap_response_cache_hits_total {response_cache.hits}',
+            '# HELP nflstatsnap_response_cache_misses_total Response cache misses.',
+            '# TYPE nflstatsnap_response_cache_misses_total counter',
+            f'nflstatsnap_response_cache_misses_total {response_cache.misses}',
+            '# HELP nflstatsnap_response_cache_entries Rendered responses currently cached.',
+            '# TYPE nflstatsnap_response_cache_entries gauge',
+            f'nflstatsnap_response_cache_entries {len(response_cache)}',
+        ]
+        if seasons is not None:
+            lines += [
+                '# HELP nflstatsnap_loaded_seasons Seasons currently held in memory.',
+                '# TYPE nflstatsnap_loaded_seasons gauge',
+                f'nflstatsnap_loaded_seasons {len(seasons)}',
+                '# HELP nflstatsnap_season_memory_bytes Estimated memory held by loaded seasons.',
+                '# TYPE nflstatsnap_season_memory_bytes gauge',
+                f'nflstatsnap_season_memory_bytes {seasons.memory_bytes()}',
+            ]
+        rss = process_rss_bytes()
+        if rss is not None:
+            lines += [
+                '# HELP nflstatsnap_process_resident_bytes Resident memory of the bot process.',
+                '# TYPE nflstatsnap_process_resident_bytes gauge',
+                f'nflstatsnap_process_resident_bytes {rss}',
+            ]
+        return '\n'.join(lines) + '\n'
+
+metrics = Metrics()
+
+# THE StageClock FOR THE COMMAND THE CURRENT WORKER THREAD IS SERVING (IF ANY)
+stage_context = threading.local()
+
+# RECORD A STAGE BOUNDARY FROM INSIDE A RESPONSE BUILDER (NO-OP WHEN CALLED OUTSIDE A COMMAND)
+def mark_stage(stage):
+    clock = getattr(stage_context, 'clock', None)
+    if clock is not None:
+        clock.mark(stage)
+
+# RUN A BUILDER ON A WORKER THREAD WITH ITS COMMAND'S CLOCK ATTACHED
+def run_with_clock(clock, func, *args):
+    clock.mark('queue')
+    stage_context.clock = clock
+    try:
+        return func(*args)
+    finally:
+        stage_context.clock = None
+
+# SERVE metrics.render_prometheus() ON http://METRICS_HOST:METRICS_PORT/metrics
+async def start_metrics_server():
+    async def handle_metrics(request):
+        return web.Response(text=metrics.render_prometheus(), content_type='text/plain')
+    
+    app = web.Application()
+    app.router.add_get('/metrics', handle_metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, METRICS_HOST, METRICS_PORT).start()
+    print(f"Metrics available at http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+    return runner
+
+# WORKER POOL SETTINGS (OVERRIDABLE FROM .ENV)
+WORKER_THREADS = int(os.getenv('WORKER_THREADS', min(4, os.cpu_count() or 1)))
+WORKER_QUEUE_SIZE = int(os.getenv('WORKER_QUEUE_SIZE', 64))
+SEASON_LOAD_THREADS = int(os.getenv('SEASON_LOAD_THREADS', 2))
+
+# RAISED WHEN THE WORKER QUEUE IS FULL AND A JOB CANNOT BE ACCEPTED
+class WorkerQueueFull(Exception):
+    pass
+
+# EXECUTION LAYER: RUNS BLOCKING PANDAS / NFL_DATA_PY WORK ON A THREAD POOL
+# SO THE DISCORD EVENT LOOP (AND GATEWAY HEARTBEAT) NEVER STALLS.
+# AT MOST WORKER_THREADS JOBS RUN AT ONCE AND AT MOST WORKER_QUEUE_SIZE MORE WAIT;
+# ANYTHING BEYOND THAT IS REJECTED INSTEAD OF PILING UP
+class WorkerPool:
+    def __init__(self, workers, queue_size):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='nflstatsnap')
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+
+    async def run(self, func, *args):
+        if not self.slots.acquire(blocking=False):
+            raise WorkerQueueFull()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(func, *args))
+        finally:
+            self.slots.release()
+
+worker_pool = WorkerPool(WORKER_THREADS, WORKER_QUEUE_SIZE)
+
+# LAZY SEASON LOADS (DOWNLOADS AND THEIR RETRIES) RUN ON THEIR OWN THREADS, SO A SLOW SEASON NEVER TIES
+# UP THE WORKER POOL THAT ANSWERS EVERY OTHER COMMAND. ALL HANDLERS WAITING ON THE SAME SEASON AWAIT
+# ONE SHARED FUTURE INSTEAD OF EACH HOLDING A THREAD
+season_loader = ThreadPoolExecutor(max_workers=SEASON_LOAD_THREADS, thread_name_prefix='nflstatsnap-seasons')
+season_loads = {}
+
+async def load_season_data(season):
+    future = season_loads.get(season)
+    if future is None:
+        future = asyncio.get_running_loop().run_in_executor(season_loader, seasons.get, season)
+        season_loads[season] = future
+        future.add_done_callback(lambda done: season_loads.pop(season, None) if season_loads.get(season) is done else None)
+    
+    # shield: ONE HANDLER GIVING UP MUST NOT CANCEL THE LOAD FOR EVERYONE ELSE
+    return await asyncio.shield(future)
+
+BUSY_MESSAGE = "🚦 NFLStatSnap is busy right now. Please try again in a moment."
+
+# LOAD ALL NFL DATA (BLOCKING - RUNS ON THE WORKER POOL)
+def load_nfl_data():
+    global player_ids, seasons
+    
+    # LOAD PLAYER IDS/NAMES MAPPING
+    pack = DataPack(DATA_PACK) if DATA_PACK else None
+    if pack is not None:
+        print(f"Using data pack {pack.version} ({DATA_PACK}) with seasons {sorted(pack.seasons)}")
+        ids = pack.load_ids()
+    else:
+        ids = load_ids_snapshot()
+        if ids is None:
+            print("Loading player ID data...")
+            ids = compact_player_ids(fetch_dataset('ids'))
+            save_ids_snapshot(ids)
+    
+    # LOAD THE DEFAULT SEASON UP FRONT, OTHER SEASONS LOAD ON FIRST USE
+    manager = SeasonDataManager(
+        lambda season: load_season(season, ids, pack),
+        SEASON_MEMORY_MB * 2**20,
+        pinned=[DEFAULT_SEASON],
+        after_load=schedule_usage
+    )
+    data = load_season(DEFAULT_SEASON, ids, pack)
+    manager.put(data)
+    
+    # PUBLISH EVERYTHING AT ONCE SO COMMANDS NEVER SEE A PARTIAL LOAD
+    player_ids, seasons = ids, manager
+    schedule_usage(data)
+
+# INCREMENTAL REFRESH OF THE CURRENT SEASON (BLOCKING - RUNS ON THE WORKER POOL)
+# NFL_DATA_PY ONLY SERVES WHOLE-SEASON WEEKLY FILES, SO WE DOWNLOAD THE FILE BUT ONLY PROCESS NEW WEEKS
+def refresh_current_season():
+    data = seasons.peek(DEFAULT_SEASON)
+    if data is None:
+        return
+    
+    start = time.perf_counter()
+    weekly = fetch_dataset('weekly', DEFAULT_SEASON)
+    
+    # THE PLAY-BY-PLAY IS ONLY RE-STREAMED WHEN THE WEEKLY DATA HAS WEEKS OUR USAGE DOESN'T COVER YET -
+    # IN THE BACKGROUND, LIKE A FIRST LOAD, SO THE DOWNLOAD NEVER HOLDS A WORKER POOL SLOT. UNTIL THEN
+    # THE REFRESHED SEASON KEEPS THE USAGE IT HAD
+    if data.usage is None or data.usage.last_week < last_regular_week(weekly):
+        queue_usage(DEFAULT_SEASON)
+    
+    refreshed = extend_season_data(data, weekly, player_ids)
+    metrics.observe(('dataset', 'refresh'), time.perf_counter() - start)
+    if refreshed is None:
+        print(f"No new weeks for {DEFAULT_SEASON} (latest is week {data.last_week})")
+        return
+    
+    # ATOMIC SWAP: COMMANDS ALREADY RUNNING KEEP THE OLD VERSION, NEW ONES PICK UP THIS ONE
+    seasons.put(refreshed)
+    response_cache.invalidate_version(data.version)
+    print(f"Refreshed {DEFAULT_SEASON} through week {refreshed.last_week} (version {refreshed.version})")
+    save_season_snapshot(refreshed)
+
+# SHARD WORKERS DON'T DOWNLOAD OR REBUILD THE CURRENT SEASON THEMSELVES - THE SUPERVISOR REFRESHES IT
+# AND REWRITES ITS SNAPSHOT, AND EACH WORKER RE-MAPS THE SNAPSHOT ONCE ITS season FILE CHANGES
+# (BLOCKING - RUNS ON THE WORKER POOL)
+def reload_shared_season():
+    data = seasons.peek(DEFAULT_SEASON)
+    path = snapshot_path(DEFAULT_SEASON, 'season.feather')
+    if data is None or not os.path.exists(path) or os.path.getmtime(path) == data.snapshot_mtime:
+        return
+    
+    reloaded = load_season_snapshot(DEFAULT_SEASON, player_ids)
+    if reloaded is None:
+        return
+    seasons.put(reloaded)
+    response_cache.invalidate_version(data.version)
+    print(f"Picked up {DEFAULT_SEASON} through week {reloaded.last_week} (version {reloaded.version})")
+
+# COMMAND TREE SYNC IS SLOW AND RATE LIMITED BY DISCORD, SO WE ONLY SYNC WHEN THE COMMANDS CHANGED:
+# A HASH OF EVERY COMMAND'S NAME, DESCRIPTION, PARAMETERS AND PERMISSIONS (PLUS THE APPLICATION ID)
+# IS KEPT NEXT TO THE SNAPSHOTS AFTER EACH SUCCESSFUL SYNC. DELETE THE FILE TO FORCE A SYNC
+def command_tree_hash():
+    commands_payload = sorted(
+        (command.to_dict(bot.tree) for command in bot.tree.get_commands()), key=lambda c: c['name']
+    )
+    blob = json.dumps({'application': bot.application_id, 'commands': commands_payload}, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+def command_tree_hash_path():
+    return os.path.join(SNAPSHOT_DIR, 'command_tree.sha256')
+
+def stored_command_tree_hash():
+    if not SNAPSHOT_DIR:
+        return None
+    try:
+        with open(command_tree_hash_path()) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def store_command_tree_hash(tree_hash):
+    if not SNAPSHOT_DIR:
+        return
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        with open(command_tree_hash_path(), 'w') as f:
+            f.write(tree_hash)
+    except OSError as e:
+        print(f"Failed to save command tree hash: {e}")
+
+# SCHEDULED TASK: PICK UP NEWLY PUBLISHED WEEKS
+@tasks.loop(minutes=REFRESH_MINUTES)
+async def refresh_data():
+    # THE FIRST ITERATION FIRES IMMEDIATELY ON START, RIGHT AFTER THE INITIAL LOAD - SKIP IT,
+    # UNLESS THE DEFAULT SEASON CAME FROM A SNAPSHOT OR DATA PACK AND MAY BE MISSING THE LATEST WEEKS
+    if refresh_data.current_loop == 0:
+        data = seasons.peek(DEFAULT_SEASON)
+        if data is None or data.source == 'download':
+            return
+    
+    try:
+        await worker_pool.run(refresh_current_season)
+    except Exception as e:
+        print(f"Error refreshing NFL data: {e}")
+        import traceback
+        traceback.print_exc()
+
+# SHARD WORKERS: HOW OFTEN TO CHECK FOR A CURRENT-SEASON SNAPSHOT PUBLISHED BY THE SUPERVISOR
+SHARED_POLL_SECONDS = float(os.getenv('SHARED_POLL_SECONDS', 30))
+
+@tasks.loop(seconds=SHARED_POLL_SECONDS)
+async def reload_shared_data():
+    try:
+        await worker_pool.run(reload_shared_season)
+    except Exception as e:
+        print(f"Error reloading shared NFL data: {e}")
+        import traceback
+        traceback.print_exc()
 
 # EVENT: BOT IS READY
 @bot.event
 async def on_ready():
-    global player_data, player_ids
+    global startup_done, metrics_server
     print(f'{bot.user} has connected to Discord!')
     
-    # LOAD NFL DATA WHEN BOT STARTS
-    print("Loading 2024 NFL season data...")
+    # on_ready FIRES AGAIN AFTER EVERY RECONNECT - DATA AND COMMANDS ARE ALREADY IN PLACE BY THEN
+    if startup_done:
+        print("Reconnected, keeping loaded data")
+        return
+    startup_done = True
+    
+    if METRICS_PORT and metrics_server is None:
+        try:
+            metrics_server = await start_metrics_server()
+        except Exception as e:
+            print(f"Failed to start metrics endpoint: {e}")
+    
     try:
-        # LOAD PLAYER IDS/NAMES MAPPING
-        print("Loading player ID data...")
-        player_ids = nfl.import_ids()
-        
-        # LOAD 2024 REGULAR SEASON STATS
-        print("Loading seasonal stats...")
-        player_data = nfl.import_seasonal_data([2024])
-        # **NOTE: 2025 REGULAR SEASON DATA NOT YET AVAILABLE, ONCE UPDATED, JUST CHANGE 2024 TO 2025**
-        
-        # MERGE PLAYER NAMES WITH STATS
-        player_data = player_data.merge(
-            player_ids[['gsis_id', 'name', 'position']],
-            left_on='player_id',
-            right_on='gsis_id',
-            how='left'
-        )
-        
-        print(f"Loaded data for {len(player_data)} player-season records")
-        
+        await worker_pool.run(load_nfl_data)
+        if SHARD_WORKER:
+            reload_shared_data.start()
+        else:
+            refresh_data.start()
     except Exception as e:
+        startup_done = False  # LET THE NEXT on_ready RETRY THE LOAD
         print(f"Error loading NFL data: {e}")
         import traceback
         traceback.print_exc()
     
+    # SLASH COMMANDS ARE GLOBAL, SO ONLY THE PROCESS RUNNING SHARD 0 SYNCS THEM
+    if SHARD_IDS is not None and 0 not in SHARD_IDS:
+        return
+    
     try:
-        synced = await bot.tree.sync()
-        print(f"Synced {len(synced)} command(s)")
+        tree_hash = command_tree_hash()
+        if tree_hash == stored_command_tree_hash():
+            print("Slash commands unchanged, skipping sync")
+        else:
+            synced = await bot.tree.sync()
+            store_command_tree_hash(tree_hash)
+            print(f"Synced {len(synced)} command(s)")
     except Exception as e:
         print(f"Failed to sync commands: {e}")
 
+# PAGINATION SETTINGS
+FILTER_PAGE_SIZE = 15          # PLAYERS PER /filterbystat PAGE
+ROSTER_NAMES_PER_LINE = 10     # NAMES PER POSITION LINE IN /roster
+ROSTER_LINES_PER_PAGE = 8      # POSITION LINES PER /roster PAGE
+PAGE_VIEW_TIMEOUT = 300        # SECONDS BEFORE PAGE BUTTONS STOP RESPONDING
+MESSAGE_LIMIT = 1900           # STAY UNDER DISCORD'S 2000 CHARACTER LIMIT
+
+# A MULTI-PAGE RESPONSE: A HEADER PLUS A CURSOR OVER AN ALREADY-ORDERED SEQUENCE OF ROWS
+# PAGE N IS JUST rows[N * page_size:(N + 1) * page_size] - NOTHING IS RE-QUERIED - AND EACH PAGE IS
+# RENDERED THE FIRST TIME SOMEONE ASKS FOR IT. THESE LIVE IN THE RESPONSE CACHE LIKE PLAIN TEXT DOES
+class PagedResult:
+    # unit NAMES WHAT A ROW IS IN THE PAGE FOOTER ("Page 1/3 · 42 players"), None LEAVES THE COUNT OUT
+    def __init__(self, header, rows, render_row, page_size, unit='results'):
+        self.header = header
+        self.rows = rows
+        self.render_row = render_row
+        self.page_size = page_size
+        self.unit = unit
+        self.page_count = max(1, -(-len(rows) // page_size))
+        self.pages = {}
+
+    def page(self, number):
+        number = min(max(number, 0), self.page_count - 1)
+        text = self.pages.get(number)
+        if text is None:
+            start = number * self.page_size
+            text = self.header + "".join(self.render_row(row) for row in self.rows[start:start + self.page_size])
+            if len(text) > MESSAGE_LIMIT:
+                text = text[:MESSAGE_LIMIT] + "\n*(Truncated due to length)*"
+            if self.page_count > 1:
+                count = f" · {len(self.rows)} {self.unit}" if self.unit else ""
+                text += f"\n*(Page {number + 1}/{self.page_count}{count})*"
+            self.pages[number] = text
+        return text
+
+# PREVIOUS/NEXT BUTTONS UNDER A PagedResult. ONLY THE USER WHO RAN THE COMMAND CAN TURN PAGES
+class PageView(discord.ui.View):
+    def __init__(self, result, owner_id):
+        super().__init__(timeout=PAGE_VIEW_TIMEOUT)
+        self.result = result
+        self.owner_id = owner_id
+        self.number = 0
+        self.message = None
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.previous_page.disabled = self.number == 0
+        self.next_page.disabled = self.number >= self.result.page_count - 1
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        if interaction.user.id != self.owner_id:
+            await interaction.response.send_message("Only the person who ran this command can change pages.", ephemeral=True)
+            return False
+        return True
+
+    async def show(self, interaction, number):
+        self.number = number
+        self.update_buttons()
+        await interaction.response.edit_message(content=self.result.page(number), view=self)
+
+    @discord.ui.button(label="◀ Prev", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.number - 1)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.number + 1)
+
+    async def on_timeout(self):
+        if self.message is not None:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
+
+# SEND A BUILDER'S RESULT: PLAIN TEXT, OR THE FIRST PAGE OF A PagedResult (WITH BUTTONS IF THERE ARE MORE)
+async def send_response(interaction, response):
+    if not isinstance(response, PagedResult):
+        await interaction.followup.send(response)
+    elif response.page_count == 1:
+        await interaction.followup.send(response.page(0))
+    else:
+        view = PageView(response, interaction.user.id)
+        view.message = await interaction.followup.send(response.page(0), view=view, wait=True)
+
+# RENDER A COMMAND RESPONSE, SERVING IT FROM THE RESPONSE CACHE WHEN POSSIBLE
+# A CACHE HIT IS ANSWERED STRAIGHT FROM THE EVENT LOOP WITHOUT TOUCHING THE WORKER POOL OR PANDAS
+# args ARE BOTH THE CACHE KEY AND WHAT THE BUILDER GETS, SO HANDLERS MUST NORMALIZE THEM FIRST
+# (E.G. "KC " AND "kc" -> "KC") - OTHERWISE ONE SPELLING'S ANSWER COULD BE CACHED FOR ANOTHER
+async def cached_response(clock, builder, season, *args):
+    data = seasons.peek(season, touch=True)
+    if data is None:
+        data = await load_season_data(season)
+        clock.mark('load')
+    
+    key = (clock.command, data.version) + args
+    response = response_cache.get(key)
+    if response is None:
+        response = await worker_pool.run(run_with_clock, clock, builder, data, *args)
+        response_cache.put(key, response)
+    else:
+        clock.mark('cache')
+    return response
+
 # COMMAND: PING
 @bot.tree.command(name="ping", description="Check if the bot is online")
 async def ping(interaction: discord.Interaction):
     await interaction.response.send_message("🏈 NFLStatSnap is online and ready!")
 
-# COMMAND: PLAYER STATS
-@bot.tree.command(name="playerstats", description="Get season stats for an NFL player")
-async def playerstats(interaction: discord.Interaction, player_name: str):
-    await interaction.response.defer()
+# WHEN A MATCHED NAME BELONGS TO SEVERAL PLAYERS, LIST THEM SO THE USER CAN PICK ONE FROM AUTOCOMPLETE
+# (WHICH OFFERS EACH OF THEM SEPARATELY) INSTEAD OF GUESSING. None WHEN THE NAME IS ONE PLAYER'S
+def ambiguous_name_message(data, match):
+    if len(match.player_ids) < 2:
+        return None
+    players = '\n'.join(f"• {data.player_labels.get(player_id, match.name)}" for player_id in match.player_ids)
+    return f"❓ {len(match.player_ids)} players are named {match.name} - pick one from the autocomplete list:\n{players}"
+
+# BUILD THE /playerstats RESPONSE (BLOCKING - RUNS ON THE WORKER POOL)
+def build_playerstats_response(data, player_name):
+    season = data.season
     
-    if player_data is None:
-        await interaction.followup.send("❌ NFL data is still loading. Please try again in a moment.")
-        return
+    # USE FUZZY MATCHING TO FIND THE PLAYER
+    match = data.name_index.lookup(player_name)
+    mark_stage('match')
+    
+    if match is None:
+        return f"❌ Could not find player: {player_name}"
+    
+    ambiguous = ambiguous_name_message(data, match)
+    if ambiguous:
+        return ambiguous
+    
+    player = data.player_store.for_match(match)
+    
+    # CALCULATE STATS
+    games_played = player.games
+    
+    # CHECK MINIMUM GAMES THRESHOLD
+    if games_played < 6:
+        return f"⚠️ {player.name} has only played {games_played} games (minimum 6 required)"
+    
+    # CALCULATE PER-GAME AVERAGES
+    passing_ypg = round(player.passing_yards / games_played, 2)
+    rushing_ypg = round(player.rushing_yards / games_played, 2)
+    receiving_ypg = round(player.receiving_yards / games_played, 2)
+    receptions_pg = round(player.receptions / games_played, 2)
+    pass_td_pg = round(player.passing_tds / games_played, 2)
+    
+    # COMBINED RUSHING + RECEIVING TDS
+    total_tds_pg = round((player.rushing_tds + player.receiving_tds) / games_played, 2)
+    
+    # FANTASY POINTS PER GAME (PPR SCORING)
+    fantasy_ppg = round(player.fantasy_points_ppr / games_played, 2)
+    
+    # GET POSITION
+    position = player.position
+    
+    mark_stage('compute')
     
+    # CREATE RESPONSE BASED ON POSITION
+    stats_message = f"**{season} Player Stats for {player.name}:**\n"
+    stats_message += f"Position: {position}\n"
+    stats_message += f"GP: {games_played}\n"
+    
+    # EACH STAT ALSO SHOWS WHERE THE PLAYER RANKS AT THEIR POSITION
+    pct = functools.partial(with_percentile, data.stat_matrix, player)
+    
+    if position == 'QB':
+        stats_message += f"PPG: {pct('passing_ypg', passing_ypg)}\n"
+        stats_message += f"RPG: {pct('rushing_ypg', rushing_ypg)}\n"
+        stats_message += f"TDPG: {pct('pass_tdpg', pass_td_pg)}\n"
+        stats_message += f"RTDPG: {pct('tdpg', total_tds_pg)}\n"
+    elif position in ['RB', 'WR']:
+        stats_message += f"RECPG: {pct('receiving_ypg', receiving_ypg)}\n"
+        stats_message += f"REC/G: {pct('rec_pg', receptions_pg)}\n"  # ADD THIS LINE
+        stats_message += f"RPG: {pct('rushing_ypg', rushing_ypg)}\n"
+        stats_message += f"SCTDPG: {pct('tdpg', total_tds_pg)}\n"
+    elif position == 'TE':
+        stats_message += f"RECPG: {pct('receiving_ypg', receiving_ypg)}\n"
+        stats_message += f"REC/G: {pct('rec_pg', receptions_pg)}\n"  # ADD THIS LINE
+        stats_message += f"SCTDPG: {pct('tdpg', total_tds_pg)}\n"
+    
+    if position in ['RB', 'WR', 'TE']:
+        stats_message += usage_lines(data, player)
+    
+    stats_message += f"FPPG: {pct('fppg', fantasy_ppg)}"
+    
+    mark_stage('render')
+    return stats_message
+
+# PLAY-BY-PLAY USAGE LINES FOR /playerstats (EMPTY WHEN THE SEASON HAS NO USAGE FOR THE PLAYER)
+def usage_lines(data, player):
+    record = data.usage.get(player.player_id) if data.usage else None
+    if record is None:
+        return ""
+    
+    lines = ""
+    if record.targets:
+        lines += f"TGT SHARE: {record.targets / record.team_targets * 100:.1f}% ({record.targets} targets)\n"
+        lines += f"AIR YDS: {record.air_yards:,.0f} (aDOT {record.air_yards / record.targets:.1f})\n"
+    touches = record.red_zone_carries + record.red_zone_receptions
+    lines += f"RZ TOUCHES: {touches} ({record.red_zone_carries} rush, {record.red_zone_receptions} rec)\n"
+    return lines
+
+# COMMAND: PLAYER STATS
+@bot.tree.command(name="playerstats", description="Get season stats for an NFL player")
+async def playerstats(interaction: discord.Interaction, player_name: str, season: Optional[int] = None):
+    clock = metrics.clock('playerstats')
     try:
-        # FILTER OUT ROWS WITHOUT NAMES
-        valid_players = player_data[player_data['name'].notna()].copy()
+        await interaction.response.defer()
+        clock.mark('defer')
         
-        # USE FUZZY MATCHING TO FIND THE PLAYER
-        player_names = valid_players['name'].tolist()
-        match = process.extractOne(player_name, player_names, scorer=fuzz.ratio)
-        
-        if match is None or match[1] < 60:  # 60% SIMILARITY THRESHOLD
-            await interaction.followup.send(f"❌ Could not find player: {player_name}")
+        if seasons is None:
+            clock.outcome = 'busy'
+            await interaction.followup.send("❌ NFL data is still loading. Please try again in a moment.")
             return
         
-        matched_name = match[0]
-        player = valid_players[valid_players['name'] == matched_name].iloc[0]
-        
-        # CALCULATE STATS
-        games_played = int(player.get('games', 0))
-        
-        # CHECK MINIMUM GAMES THRESHOLD
-        if games_played < 6:
-            await interaction.followup.send(
-                f"⚠️ {player['name']} has only played {games_played} games (minimum 6 required)"
-            )
+        # DEFAULT TO THE CURRENT SEASON AND REJECT SEASONS WE HAVE NO DATA FOR
+        season = season or DEFAULT_SEASON
+        if season_error(season):
+            await interaction.followup.send(season_error(season))
             return
         
-        # CALCULATE PER-GAME AVERAGES
-        passing_ypg = round(float(player.get('passing_yards', 0)) / games_played, 2) if games_played > 0 else 0
-        rushing_ypg = round(float(player.get('rushing_yards', 0)) / games_played, 2) if games_played > 0 else 0
-        receiving_ypg = round(float(player.get('receiving_yards', 0)) / games_played, 2) if games_played > 0 else 0
-        receptions_pg = round(float(player.get('receptions', 0)) / games_played, 2) if games_played > 0 else 0  # ADD THIS LINE
-        pass_td_pg = round(float(player.get('passing_tds', 0)) / games_played, 2) if games_played > 0 else 0
-        
-        # COMBINED RUSHING + RECEIVING TDS
-        rushing_tds = float(player.get('rushing_tds', 0))
-        receiving_tds = float(player.get('receiving_tds', 0))
-        total_tds_pg = round((rushing_tds + receiving_tds) / games_played, 2) if games_played > 0 else 0
-        
-        # FANTASY POINTS PER GAME (PPR SCORING)
-        fantasy_ppg = round(float(player.get('fantasy_points_ppr', 0)) / games_played, 2) if games_played > 0 else 0
-        
-        # GET POSITION
-        # GET POSITION - CHECK MULTIPLE POSSIBLE COLUMNS
-        if 'position_y' in player.index and pd.notna(player.get('position_y')):
-            position = player['position_y']
-        elif 'position_x' in player.index and pd.notna(player.get('position_x')):
-            position = player['position_x']
-        elif 'position' in player.index and pd.notna(player.get('position')):
-            position = player['position']
-        else:
-            position = 'N/A'
-        
-        # CREATE RESPONSE BASED ON POSITION
-        stats_message = f"**Player Stats for {player['name']}:**\n"
-        stats_message += f"Position: {position}\n"
-        stats_message += f"GP: {games_played}\n"
-        
-        if position == 'QB':
-            stats_message += f"PPG: {passing_ypg}\n"
-            stats_message += f"RPG: {rushing_ypg}\n"
-            stats_message += f"TDPG: {pass_td_pg}\n"
-            stats_message += f"RTDPG: {total_tds_pg}\n"
-        elif position in ['RB', 'WR']:
-            stats_message += f"RECPG: {receiving_ypg}\n"
-            stats_message += f"REC/G: {receptions_pg}\n"  # ADD THIS LINE
-            stats_message += f"RPG: {rushing_ypg}\n"
-            stats_message += f"SCTDPG: {total_tds_pg}\n"
-        elif position == 'TE':
-            stats_message += f"RECPG: {receiving_ypg}\n"
-            stats_message += f"REC/G: {receptions_pg}\n"  # ADD THIS LINE
-            stats_message += f"SCTDPG: {total_tds_pg}\n"
-        
-        stats_message += f"FPPG: {fantasy_ppg}"
-        
-        await interaction.followup.send(stats_message)
+        response = await cached_response(
+            clock, build_playerstats_response, season, normalize_name(player_name)
+        )
+        await interaction.followup.send(response)
+        clock.mark('send')
         
+    except WorkerQueueFull:
+        clock.outcome = 'busy'
+        await interaction.followup.send(BUSY_MESSAGE)
     except Exception as e:
+        clock.outcome = 'error'
         await interaction.followup.send(f"❌ Error processing player stats: {str(e)}")
         print(f"Error in playerstats command: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        clock.finish()
+
+# BUILD THE /filterbystat RESPONSE (BLOCKING - RUNS ON THE WORKER POOL)
+# stat IS EITHER ONE STAT NAME COMPARED AGAINST threshold, OR A FULL QUERY LIKE "fppg>=15 and games>=10"
+def build_filterbystat_response(data, position, stat, threshold=None, sort=None):
+    season = data.season
+    stat_matrix = data.stat_matrix
+    
+    # FILTER BY POSITION
+    position = position.upper()
+
+    if position not in stat_matrix.position_set:
+        return f"❌ No players found for position: {position}"
+    
+    # PARSE (CACHED) AND RUN THE QUERY AS ONE MASK OVER THE SORTED ORDERING
+    # A BARE STAT NAME PLUS THRESHOLD MEANS "<stat> >= <threshold>" AND IS BUILT WITHOUT THE PARSER,
+    # SO ANY THRESHOLD WORKS AND THE OLD LOOSE STAT NAMES ("Fantasy PPR", "pass ypg") STILL RESOLVE
+    # A QUERY CARRIES ITS OWN THRESHOLDS, SO A threshold NEXT TO ONE IS REFUSED RATHER THAN DROPPED
+    try:
+        if any(operator in stat for operator in QUERY_OPERATORS):
+            if threshold is not None:
+                return f"❌ `{stat.strip()}` already has its own threshold - leave threshold empty, or add it to the query (e.g. `fppg>=15 and games>=10`)"
+            query_text = stat.strip()
+            query = compile_query(query_text, sort)
+        elif threshold is None:
+            return f"❌ Give a threshold for {stat}, or write a query like `fppg>=15 and games>=10`"
+        else:
+            stat_key = resolve_stat_key(stat) or resolve_loose_stat_key(stat)
+            if stat_key is None:
+                return f"❌ Unknown stat: {stat}. Try: {', '.join(STAT_SUGGESTIONS)}"
+            query_text = f"{stat} >= {np.format_float_positional(threshold, trim='0')}"
+            query = compile_conditions((Condition(stat_key, '>=', float(threshold)),), sort)
+    except QueryError as e:
+        return f"❌ {e}"
+    rows = query.run(stat_matrix, position)
+    
+    if len(rows) == 0:
+        return f"❌ No {position} players with {query_text}"
+    
+    mark_stage('compute')
+    
+    # PAGES ARE SLICES OF THE MATCHING ROWS, ALREADY IN ORDER; ONLY THE FIRST IS RENDERED NOW
+    response = PagedResult(
+        f"**{season} {position} players with {query_text}:**\n\n",
+        rows,
+        functools.partial(render_filter_row, stat_matrix, query.shown),
+        FILTER_PAGE_SIZE,
+        unit='players'
+    )
+    response.page(0)
+    
+    mark_stage('render')
+    return response
+
+# ONE /filterbystat LINE: THE SORT STAT ALONE, OR EVERY STAT THE QUERY USES
+def render_filter_row(stat_matrix, shown, row):
+    games = int(stat_matrix.games[row])
+    if len(shown) == 1:
+        stat_val = round(stat_matrix.value(row, shown[0]), 2)
+    else:
+        stat_val = ", ".join(f"{key} {round(stat_matrix.value(row, key), 2)}" for key in shown)
+    return f"• {stat_matrix.names[row]}: {stat_val} ({games} GP)\n"
 
 # COMMAND: FILTER BY STAT
-@bot.tree.command(name="filterbystat", description="Filter players by a stat threshold")
+@bot.tree.command(name="filterbystat", description="Filter players by a stat threshold or a query")
+@app_commands.describe(
+    stat="A stat (used with threshold) or a query like: fppg>=15 and rec/g>5 and games>=10",
+    threshold="Minimum value when stat is a single stat name (leave empty for a query)",
+    sort="Stat to sort by (defaults to the first stat in the query)"
+)
 async def filterbystat(
     interaction: discord.Interaction,
     position: str,
     stat: str,
-    threshold: float
+    threshold: Optional[float] = None,
+    season: Optional[int] = None,
+    sort: Optional[str] = None
 ):
-    await interaction.response.defer()
-    
-    if player_data is None:
-        await interaction.followup.send("❌ NFL data is still loading. Please try again in a moment.")
-        return
-    
+    clock = metrics.clock('filterbystat')
     try:
-        # FILTER OUT ROWS WITHOUT NAMES
-        valid_players = player_data[player_data['name'].notna()].copy()
-        
-
-        # FILTER BY POSITION
-        position = position.upper()
-
-        # CHECK WHICH POSITION COLUMN EXISTS
-        if 'position_y' in valid_players.columns:
-            pos_col = 'position_y'
-        elif 'position_x' in valid_players.columns:
-            pos_col = 'position_x'
-        elif 'position' in valid_players.columns:
-            pos_col = 'position'
-        else:
-            await interaction.followup.send("❌ Error: Position column not found in data")
-            return
-
-        position_filtered = valid_players[valid_players[pos_col] == position]
-
-        if position_filtered.empty:
-            await interaction.followup.send(f"❌ No players found for position: {position}")
-            return
+        await interaction.response.defer()
+        clock.mark('defer')
         
-        # FILTER BY MINIMUM GAMES (6+)
-        position_filtered = position_filtered[position_filtered['games'] >= 6]
-        
-        # MAP STAT NAMES TO COLUMN NAMES AND CALCULATE PER-GAME STATS
-        stat_lower = stat.lower().replace(" ", "_")
-        
-        # CALCULATE PER-GAME STATS
-        if 'ypg' in stat_lower or 'yards_per_game' in stat_lower:
-            if 'pass' in stat_lower:
-                position_filtered['stat_value'] = position_filtered['passing_yards'] / position_filtered['games']
-            elif 'rush' in stat_lower:
-                position_filtered['stat_value'] = position_filtered['rushing_yards'] / position_filtered['games']
-            elif 'rec' in stat_lower or 'receiv' in stat_lower:
-                position_filtered['stat_value'] = position_filtered['receiving_yards'] / position_filtered['games']
-        elif 'tdpg' in stat_lower or 'td_per_game' in stat_lower:
-            if 'pass' in stat_lower:
-                position_filtered['stat_value'] = position_filtered['passing_tds'] / position_filtered['games']
-            else:
-                position_filtered['stat_value'] = (position_filtered['rushing_tds'] + position_filtered['receiving_tds']) / position_filtered['games']
-        elif 'fppg' in stat_lower or 'fantasy' in stat_lower:
-            position_filtered['stat_value'] = position_filtered['fantasy_points_ppr'] / position_filtered['games']
-        elif 'rec/g' in stat_lower or 'receptions_per_game' in stat_lower:
-            position_filtered['stat_value'] = position_filtered['receptions'] / position_filtered['games']
-        else:
-            await interaction.followup.send(f"❌ Unknown stat: {stat}. Try: passing_ypg, rushing_ypg, receiving_ypg, tdpg, fppg, rec/g")
+        if seasons is None:
+            clock.outcome = 'busy'
+            await interaction.followup.send("❌ NFL data is still loading. Please try again in a moment.")
             return
         
-        # FILTER BY THRESHOLD
-        filtered = position_filtered[position_filtered['stat_value'] >= threshold]
-        
-        if filtered.empty:
-            await interaction.followup.send(f"❌ No {position} players with {stat} >= {threshold}")
+        # DEFAULT TO THE CURRENT SEASON AND REJECT SEASONS WE HAVE NO DATA FOR
+        season = season or DEFAULT_SEASON
+        if season_error(season):
+            await interaction.followup.send(season_error(season))
             return
         
-        # SORT BY STAT VALUE (DESCENDING)
-        filtered = filtered.sort_values('stat_value', ascending=False)
-        
-        # LIMIT TO TOP 15 RESULTS
-        filtered = filtered.head(15)
-        
-        # CREATE RESPONSE
-        response = f"**{position} players with {stat} >= {threshold}:**\n\n"
-        
-        for idx, player in filtered.iterrows():
-            stat_val = round(player['stat_value'], 2)
-            games = int(player['games'])
-            response += f"• {player['name']}: {stat_val} ({games} GP)\n"
-        
-        if len(filtered) == 15:
-            response += "\n*(Showing top 15 results)*"
-        
-        await interaction.followup.send(response)
+        response = await cached_response(
+            clock, build_filterbystat_response, season,
+            position.strip().upper(), stat.strip().lower(), threshold, sort and sort.strip().lower()
+        )
+        await send_response(interaction, response)
+        clock.mark('send')
         
+    except WorkerQueueFull:
+        clock.outcome = 'busy'
+        await interaction.followup.send(BUSY_MESSAGE)
     except Exception as e:
+        clock.outcome = 'error'
         await interaction.followup.send(f"❌ Error filtering players: {str(e)}")
         print(f"Error in filterbystat command: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        clock.finish()
+
+# BUILD THE /roster RESPONSE (BLOCKING - RUNS ON THE WORKER POOL)
+def build_roster_response(data, team):
+    season = data.season
+    roster_cache = data.roster_cache
+    
+    # NORMALIZE TEAM INPUT
+    team_upper = team.upper()
+    
+    # LOOK UP THE PREBUILT TEAM ROSTER
+    team_roster = roster_cache.get(team_upper)
+    
+    if team_roster is None:
+        return f"❌ No roster found for team: {team}. Try team abbreviations like: KC, SF, BAL, BUF, DAL, etc."
+    
+    # ONE LINE PER ROSTER_NAMES_PER_LINE PLAYERS, POSITIONS IN DISPLAY ORDER
+    lines = [
+        (pos, names[start:start + ROSTER_NAMES_PER_LINE])
+        for pos in ROSTER_POSITIONS
+        for names in [team_roster.get(pos, [])]
+        for start in range(0, len(names), ROSTER_NAMES_PER_LINE)
+    ]
+    
+    mark_stage('compute')
+    
+    response = PagedResult(
+        f"**{team_upper} Roster ({season} Season):**\n\n",
+        lines,
+        render_roster_line,
+        ROSTER_LINES_PER_PAGE,
+        unit=None
+    )
+    response.page(0)
+    
+    mark_stage('render')
+    return response
 
+def render_roster_line(line):
+    pos, names = line
+    return f"**{pos}:** {', '.join(names)}\n"
 
 # COMMAND: ROSTER
 @bot.tree.command(name="roster", description="Get an NFL team's roster")
-async def roster(interaction: discord.Interaction, team: str):
-    await interaction.response.defer()
-    
-    if player_ids is None:
-        await interaction.followup.send("❌ Player data is still loading. Please try again in a moment.")
-        return
-    
+async def roster(interaction: discord.Interaction, team: str, season: Optional[int] = None):
+    clock = metrics.clock('roster')
     try:
-        # LOAD ROSTER DATA FOR 2024
-        print(f"Loading roster for team: {team}")
-        rosters = nfl.import_seasonal_rosters([2024])  # CHANGED FROM IMPORT_ROSTERS
-        
-        # MERGE WITH PLAYER NAMES
-        rosters = rosters.merge(
-            player_ids[['gsis_id', 'name']],
-            left_on='player_id',
-            right_on='gsis_id',
-            how='left'
-        )
-        
-        # NORMALIZE TEAM INPUT
-        team_upper = team.upper()
-        
-        # FILTER BY TEAM
-        team_roster = rosters[rosters['team'] == team_upper]
+        await interaction.response.defer()
+        clock.mark('defer')
         
-        if team_roster.empty:
-            await interaction.followup.send(
-                f"❌ No roster found for team: {team}. Try team abbreviations like: KC, SF, BAL, BUF, DAL, etc."
-            )
+        if seasons is None:
+            clock.outcome = 'busy'
+            await interaction.followup.send("❌ Player data is still loading. Please try again in a moment.")
             return
         
-        # GROUP BY POSITION
-        positions_order = ['QB', 'RB', 'WR', 'TE', 'OL', 'DL', 'LB', 'DB', 'K', 'P']
-        
-        response = f"**{team_upper} Roster (2024 Season):**\n\n"
-        
-        for pos in positions_order:
-            pos_players = team_roster[team_roster['position'] == pos]
-            if not pos_players.empty:
-                response += f"**{pos}:** "
-                # USE 'NAME' COLUMN FROM MERGED DATA
-                names = pos_players['name'].dropna().tolist()
-                if names:
-                    response += ", ".join(names[:10])  # LIMIT TO 10 PLAYERS PER POSITION
-                    if len(names) > 10:
-                        response += f" (+{len(names)-10} more)"
-                response += "\n"
-        
-        # DISCORD HAS A 2000 CHARACTER LIMIT, SO TRUNCATE IF NEEDED
-        if len(response) > 1900:
-            response = response[:1900] + "\n\n*(Roster truncated due to length)*"
+        # DEFAULT TO THE CURRENT SEASON AND REJECT SEASONS WE HAVE NO DATA FOR
+        season = season or DEFAULT_SEASON
+        if season_error(season):
+            await interaction.followup.send(season_error(season))
+            return
         
-        await interaction.followup.send(response)
+        response = await cached_response(
+            clock, build_roster_response, season, team.strip().upper())
+        await send_response(interaction, response)
+        clock.mark('send')
         
+    except WorkerQueueFull:
+        clock.outcome = 'busy'
+        await interaction.followup.send(BUSY_MESSAGE)
     except Exception as e:
+        clock.outcome = 'error'
         await interaction.followup.send(f"❌ Error loading roster: {str(e)}")
         print(f"Error in roster command: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        clock.finish()
 
-# COMMAND: COMPARE STATS
-@bot.tree.command(name="comparestats", description="Compare two players side-by-side")
-async def comparestats(interaction: discord.Interaction, player1: str, player2: str):
-    await interaction.response.defer()
+# BUILD THE /comparestats RESPONSE (BLOCKING - RUNS ON THE WORKER POOL)
+def build_comparestats_response(data, player1, player2):
+    season = data.season
     
-    if player_data is None:
-        await interaction.followup.send("❌ NFL data is still loading. Please try again in a moment.")
-        return
+    # FIND BOTH PLAYERS USING ONE BATCHED FUZZY MATCH
+    match1, match2 = data.name_index.lookup_many([player1, player2])
+    mark_stage('match')
+    
+    if match1 is None:
+        return f"❌ Could not find player: {player1}"
+    
+    if match2 is None:
+        return f"❌ Could not find player: {player2}"
+    
+    ambiguous = ambiguous_name_message(data, match1) or ambiguous_name_message(data, match2)
+    if ambiguous:
+        return ambiguous
     
+    # GET PLAYER DATA
+    p1_data = data.player_store.for_match(match1)
+    p2_data = data.player_store.for_match(match2)
+    
+    # GET POSITIONS
+    p1_pos = p1_data.position
+    p2_pos = p2_data.position
+    
+    # CALCULATE STATS FOR BOTH PLAYERS
+    def calc_stats(player):
+        games = player.games
+        if games < 6:
+            return None
+        
+        stats = {
+            'games': games,
+            'passing_ypg': round(player.passing_yards / games, 2),
+            'rushing_ypg': round(player.rushing_yards / games, 2),
+            'receiving_ypg': round(player.receiving_yards / games, 2),
+            'receptions_pg': round(player.receptions / games, 2),
+            'pass_td_pg': round(player.passing_tds / games, 2),
+            'total_td_pg': round((player.rushing_tds + player.receiving_tds) / games, 2),
+            'fppg': round(player.fantasy_points_ppr / games, 2)
+        }
+        return stats
+    
+    p1_stats = calc_stats(p1_data)
+    p2_stats = calc_stats(p2_data)
+    
+    if p1_stats is None:
+        return f"⚠️ {p1_data.name} has played fewer than 6 games"
+    
+    if p2_stats is None:
+        return f"⚠️ {p2_data.name} has played fewer than 6 games"
+    
+    mark_stage('compute')
+    
+    # CREATE COMPARISON
+    response = f"**{season} Player Comparison:**\n\n"
+    response += f"**{p1_data.name}** ({p1_pos}) vs **{p2_data.name}** ({p2_pos})\n\n"
+    
+    response += f"**Games Played:** {p1_stats['games']} vs {p2_stats['games']}\n"
+    
+    # EACH VALUE ALSO SHOWS WHERE THAT PLAYER RANKS AT THEIR OWN POSITION
+    def both(label, key, stat_key):
+        p1 = with_percentile(data.stat_matrix, p1_data, stat_key, p1_stats[key])
+        p2 = with_percentile(data.stat_matrix, p2_data, stat_key, p2_stats[key])
+        return f"**{label}:** {p1} vs {p2}\n"
+    
+    # SHOW RELEVANT STATS BASED ON POSITION
+    if p1_pos == 'QB' or p2_pos == 'QB':
+        response += both("Passing YPG", 'passing_ypg', 'passing_ypg')
+        response += both("Rushing YPG", 'rushing_ypg', 'rushing_ypg')
+        response += both("Pass TD/G", 'pass_td_pg', 'pass_tdpg')
+    
+    if p1_pos in ['RB', 'WR', 'TE'] or p2_pos in ['RB', 'WR', 'TE']:
+        response += both("Receiving YPG", 'receiving_ypg', 'receiving_ypg')
+        response += both("Receptions/G", 'receptions_pg', 'rec_pg')
+        response += both("Rushing YPG", 'rushing_ypg', 'rushing_ypg')
+        response += both("Total TD/G", 'total_td_pg', 'tdpg')
+    
+    response += "\n" + both("Fantasy PPG (PPR)", 'fppg', 'fppg')
+    
+    # DETERMINE WINNER
+    if p1_stats['fppg'] > p2_stats['fppg']:
+        winner = p1_data.name
+    elif p2_stats['fppg'] > p1_stats['fppg']:
+        winner = p2_data.name
+    else:
+        winner = "Tie"
+    
+    response += f"\n**Fantasy Leader:** {winner}"
+    
+    mark_stage('render')
+    return response
+
+# COMMAND: COMPARE STATS
+@bot.tree.command(name="comparestats", description="Compare two players side-by-side")
+async def comparestats(interaction: discord.Interaction, player1: str, player2: str, season: Optional[int] = None):
+    clock = metrics.clock('comparestats')
     try:
-        from rapidfuzz import process, fuzz
-        
-        # FILTER OUT ROWS WITHOUT NAMES
-        valid_players = player_data[player_data['name'].notna()].copy()
-        
-        # FIND BOTH PLAYERS USING FUZZY MATCHING
-        player_names = valid_players['name'].tolist()
+        await interaction.response.defer()
+        clock.mark('defer')
         
-        match1 = process.extractOne(player1, player_names, scorer=fuzz.ratio)
-        match2 = process.extractOne(player2, player_names, scorer=fuzz.ratio)
-        
-        if match1 is None or match1[1] < 60:
-            await interaction.followup.send(f"❌ Could not find player: {player1}")
+        if seasons is None:
+            clock.outcome = 'busy'
+            await interaction.followup.send("❌ NFL data is still loading. Please try again in a moment.")
             return
         
-        if match2 is None or match2[1] < 60:
-            await interaction.followup.send(f"❌ Could not find player: {player2}")
+        # DEFAULT TO THE CURRENT SEASON AND REJECT SEASONS WE HAVE NO DATA FOR
+        season = season or DEFAULT_SEASON
+        if season_error(season):
+            await interaction.followup.send(season_error(season))
             return
         
-        # GET PLAYER DATA
-        p1_data = valid_players[valid_players['name'] == match1[0]].iloc[0]
-        p2_data = valid_players[valid_players['name'] == match2[0]].iloc[0]
-        
-        # DETERMINE POSITION COLUMN
-        if 'position_y' in valid_players.columns:
-            pos_col = 'position_y'
-        elif 'position_x' in valid_players.columns:
-            pos_col = 'position_x'
-        else:
-            pos_col = 'position'
+        response = await cached_response(
+            clock, build_comparestats_response, season, normalize_name(player1), normalize_name(player2)
+        )
+        await interaction.followup.send(response)
+        clock.mark('send')
         
-        # GET POSITIONS
-        p1_pos = p1_data.get(pos_col, 'N/A')
-        p2_pos = p2_data.get(pos_col, 'N/A')
+    except WorkerQueueFull:
+        clock.outcome = 'busy'
+        await interaction.followup.send(BUSY_MESSAGE)
+    except Exception as e:
+        clock.outcome = 'error'
+        await interaction.followup.send(f"❌ Error comparing players: {str(e)}")
+        print(f"Error in comparestats command: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        clock.finish()
+
+# BATCH COMPARISON / LEADERBOARD SETTINGS
+COMPARE_MAX_PLAYERS = 10       # NAMES ALLOWED IN ONE /compareplayers
+COMPARE_PAGE_SIZE = 4          # PLAYERS PER /compareplayers PAGE (A PLAYER'S LINE WITH PERCENTILES RUNS ~200 CHARACTERS)
+LEADERBOARD_PAGE_SIZE = 10     # PLAYERS PER /leaderboard PAGE
+LEADERBOARD_MAX_STATS = 6      # STAT COLUMNS ALLOWED IN ONE /compareplayers OR /leaderboard
+
+# PLAYER NAMES IN /compareplayers ARE SEPARATED BY COMMAS, SEMICOLONS OR NEW LINES
+PLAYER_LIST_SEPARATOR = re.compile(r'\s*[,;\n]\s*')
+
+def split_player_list(players):
+    return [name for name in PLAYER_LIST_SEPARATOR.split(players.strip()) if name]
+
+# STATS SHOWN WHEN /leaderboard IS RUN WITHOUT stats (THE FIRST ONE IS THE DEFAULT SORT)
+LEADERBOARD_STATS = {
+    'QB': ['fppg', 'passing_ypg', 'pass_tdpg', 'rushing_ypg'],
+    'RB': ['fppg', 'rushing_ypg', 'receiving_ypg', 'rec_pg', 'tdpg'],
+    'WR': ['fppg', 'receiving_ypg', 'rec_pg', 'tdpg'],
+    'TE': ['fppg', 'receiving_ypg', 'rec_pg', 'tdpg'],
+}
+
+# STATS SHOWN WHEN /compareplayers IS RUN WITHOUT stats - THE SAME PICK AS /comparestats
+def default_compare_stats(positions):
+    keys = ['fppg']
+    if 'QB' in positions:
+        keys += ['passing_ypg', 'rushing_ypg', 'pass_tdpg']
+    if positions & {'RB', 'WR', 'TE'}:
+        keys += ['receiving_ypg', 'rec_pg', 'rushing_ypg', 'tdpg']
+    return list(dict.fromkeys(keys))
+
+# ONE PLAYER LINE FOR /compareplayers AND /leaderboard: EACH STAT, WITH ITS POSITION PERCENTILE WHEN GIVEN
+def render_stat_line(prefix, stat_keys, values, percentiles=None):
+    parts = []
+    for i, key in enumerate(stat_keys):
+        value = round(float(values[i]), 2)
+        if value.is_integer():
+            value = int(value)  # COUNTING TOTALS (GAMES, YARDS, TDS) READ BETTER WITHOUT ".0"
+        part = f"{key} {value}"
+        if percentiles is not None and not np.isnan(percentiles[i]):
+            part += f" ({ordinal(min(99, int(percentiles[i])))})"
+        parts.append(part)
+    return f"{prefix}: {' · '.join(parts)}\n"
+
+# BUILD THE /compareplayers RESPONSE (BLOCKING - RUNS ON THE WORKER POOL)
+# players IS A COMMA-SEPARATED LIST OF NAMES, stats AN OPTIONAL COMMA-SEPARATED LIST OF STATS
+def build_compareplayers_response(data, players, stats=None):
+    season = data.season
+    stat_matrix = data.stat_matrix
+    
+    names = split_player_list(players)
+    if len(names) < 2:
+        return "❌ List at least two players, separated by commas"
+    if len(names) > COMPARE_MAX_PLAYERS:
+        return f"❌ Compare at most {COMPARE_MAX_PLAYERS} players at a time"
+    
+    try:
+        stat_keys = list(parse_stat_list(stats)) if stats else None
+    except QueryError as e:
+        return f"❌ {e}"
+    if stat_keys and len(stat_keys) > LEADERBOARD_MAX_STATS:
+        return f"❌ Pick at most {LEADERBOARD_MAX_STATS} stats"
+    
+    # RESOLVE EVERY NAME IN ONE BATCHED FUZZY MATCH
+    matches = data.name_index.lookup_many(names)
+    mark_stage('match')
+    
+    missing = [name for name, match in zip(names, matches) if match is None]
+    ambiguous = [ambiguous_name_message(data, match) for match in matches if match is not None]
+    ambiguous = [message for message in ambiguous if message]
+    if ambiguous:
+        return '\n\n'.join(ambiguous)
+    found = [data.player_store.for_match(match) for match in matches if match is not None]
+    
+    # STAT MATRIX ROWS, IN THE ORDER GIVEN (THE SAME PLAYER NAMED TWICE IS SHOWN ONCE)
+    rows = np.array(
+        list(dict.fromkeys(stat_matrix.row_of[player.player_id] for player in found if player is not None)),
+        dtype=np.int64
+    )
+    eligible = stat_matrix.games[rows] >= MIN_GAMES
+    too_few = [stat_matrix.names[row] for row in rows[~eligible]]
+    rows = rows[eligible]
+    
+    notes = ""
+    if missing:
+        notes += f"❌ Could not find: {', '.join(missing)}\n"
+    if too_few:
+        notes += f"⚠️ Fewer than {MIN_GAMES} games: {', '.join(too_few)}\n"
+    if len(rows) < 2:
+        return notes + "❌ Need at least two players with enough games to compare"
+    
+    stat_keys = stat_keys or default_compare_stats(set(stat_matrix.positions[rows].tolist()))
+    columns = [stat_matrix.columns[key] for key in stat_keys]
+    
+    # EVERY STAT AND PERCENTILE OF EVERY PLAYER IN ONE SLICE OF THE MATRIX, BEST FIRST BY THE FIRST STAT,
+    # AND EACH STAT'S LEADER FROM ONE argmax OVER THE COLUMNS
+    values = stat_matrix.values[np.ix_(rows, columns)]
+    percentiles = stat_matrix.percentiles[np.ix_(rows, columns)]
+    order = np.argsort(-values[:, 0], kind='stable')
+    leaders = values.argmax(axis=0)
+    
+    mark_stage('compute')
+    
+    header = f"**{season} Player Comparison ({len(rows)} players):**\n\n" + notes
+    header += "**Leaders:** " + " · ".join(
+        f"{STAT_REGISTRY[key].label} {stat_matrix.names[rows[leader]]}" for key, leader in zip(stat_keys, leaders)
+    ) + "\n\n"
+    
+    def render_player(i):
+        row = rows[i]
+        prefix = f"**{stat_matrix.names[row]}** ({stat_matrix.positions[row]}, {stat_matrix.games[row]} GP)"
+        return render_stat_line(prefix, stat_keys, values[i], percentiles[i])
+    
+    response = PagedResult(header, order, render_player, COMPARE_PAGE_SIZE, unit='players')
+    response.page(0)
+    
+    mark_stage('render')
+    return response
+
+# COMMAND: COMPARE MANY PLAYERS
+@bot.tree.command(name="compareplayers", description="Compare up to 10 players at once")
+@app_commands.describe(
+    players="Player names separated by commas, e.g. Puka Nacua, Nico Collins, Drake London",
+    stats="Stats to compare, separated by commas (defaults depend on the players' positions)"
+)
+async def compareplayers(
+    interaction: discord.Interaction,
+    players: str,
+    stats: Optional[str] = None,
+    season: Optional[int] = None
+):
+    clock = metrics.clock('compareplayers')
+    try:
+        await interaction.response.defer()
+        clock.mark('defer')
         
-        # CALCULATE STATS FOR BOTH PLAYERS
-        def calc_stats(player):
-            games = int(player.get('games', 0))
-            if games < 6:
-                return None
-            
-            stats = {
-                'games': games,
-                'passing_ypg': round(float(player.get('passing_yards', 0)) / games, 2),
-                'rushing_ypg': round(float(player.get('rushing_yards', 0)) / games, 2),
-                'receiving_ypg': round(float(player.get('receiving_yards', 0)) / games, 2),
-                'receptions_pg': round(float(player.get('receptions', 0)) / games, 2),
-                'pass_td_pg': round(float(player.get('passing_tds', 0)) / games, 2),
-                'total_td_pg': round((float(player.get('rushing_tds', 0)) + float(player.get('receiving_tds', 0))) / games, 2),
-                'fppg': round(float(player.get('fantasy_points_ppr', 0)) / games, 2)
-            }
-            return stats
-        
-        p1_stats = calc_stats(p1_data)
-        p2_stats = calc_stats(p2_data)
-        
-        if p1_stats is None:
-            await interaction.followup.send(f"⚠️ {p1_data['name']} has played fewer than 6 games")
+        if seasons is None:
+            clock.outcome = 'busy'
+            await interaction.followup.send("❌ NFL data is still loading. Please try again in a moment.")
             return
         
-        if p2_stats is None:
-            await interaction.followup.send(f"⚠️ {p2_data['name']} has played fewer than 6 games")
+        # DEFAULT TO THE CURRENT SEASON AND REJECT SEASONS WE HAVE NO DATA FOR
+        season = season or DEFAULT_SEASON
+        if season_error(season):
+            await interaction.followup.send(season_error(season))
             return
         
-        # CREATE COMPARISON
-        response = f"**Player Comparison:**\n\n"
-        response += f"**{p1_data['name']}** ({p1_pos}) vs **{p2_data['name']}** ({p2_pos})\n\n"
-        
-        response += f"**Games Played:** {p1_stats['games']} vs {p2_stats['games']}\n"
-        
-        # SHOW RELEVANT STATS BASED ON POSITION
-        if p1_pos == 'QB' or p2_pos == 'QB':
-            response += f"**Passing YPG:** {p1_stats['passing_ypg']} vs {p2_stats['passing_ypg']}\n"
-            response += f"**Rushing YPG:** {p1_stats['rushing_ypg']} vs {p2_stats['rushing_ypg']}\n"
-            response += f"**Pass TD/G:** {p1_stats['pass_td_pg']} vs {p2_stats['pass_td_pg']}\n"
-        
-        if p1_pos in ['RB', 'WR', 'TE'] or p2_pos in ['RB', 'WR', 'TE']:
-            response += f"**Receiving YPG:** {p1_stats['receiving_ypg']} vs {p2_stats['receiving_ypg']}\n"
-            response += f"**Receptions/G:** {p1_stats['receptions_pg']} vs {p2_stats['receptions_pg']}\n"
-            response += f"**Rushing YPG:** {p1_stats['rushing_ypg']} vs {p2_stats['rushing_ypg']}\n"
-            response += f"**Total TD/G:** {p1_stats['total_td_pg']} vs {p2_stats['total_td_pg']}\n"
-        
-        response += f"\n**Fantasy PPG (PPR):** {p1_stats['fppg']} vs {p2_stats['fppg']}\n"
-        
-        # DETERMINE WINNER
-        if p1_stats['fppg'] > p2_stats['fppg']:
-            winner = p1_data['name']
-        elif p2_stats['fppg'] > p1_stats['fppg']:
-            winner = p2_data['name']
-        else:
-            winner = "Tie"
-        
-        response += f"\n**Fantasy Leader:** {winner}"
-        
-        await interaction.followup.send(response)
+        response = await cached_response(
+            clock, build_compareplayers_response, season,
+            ', '.join(normalize_name(name) for name in split_player_list(players)), stats and stats.strip().lower()
+        )
+        await send_response(interaction, response)
+        clock.mark('send')
         
+    except WorkerQueueFull:
+        clock.outcome = 'busy'
+        await interaction.followup.send(BUSY_MESSAGE)
     except Exception as e:
+        clock.outcome = 'error'
         await interaction.followup.send(f"❌ Error comparing players: {str(e)}")
-        print(f"Error in comparestats command: {e}")
+        print(f"Error in compareplayers command: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        clock.finish()
 
-# COMMAND: WEEKLY STATS
-@bot.tree.command(name="weeklystats", description="Get a player's stats for a specific week")
-async def weeklystats(interaction: discord.Interaction, player_name: str, week: int):
-    await interaction.response.defer()
+# BUILD THE /leaderboard RESPONSE (BLOCKING - RUNS ON THE WORKER POOL)
+def build_leaderboard_response(data, position, stats=None, sort=None):
+    season = data.season
+    stat_matrix = data.stat_matrix
     
-    if player_ids is None:
-        await interaction.followup.send("❌ Player data is still loading. Please try again in a moment.")
-        return
+    position = position.upper()
+    if position not in stat_matrix.position_set:
+        return f"❌ No players found for position: {position}"
     
     try:
-        from rapidfuzz import process, fuzz
-        
-        # LOAD WEEKLY DATA FOR 2024
-        print(f"Loading weekly data for week {week}...")
-        weekly_data = nfl.import_weekly_data([2024])
-        
-        # MERGE WITH PLAYER NAMES
-        weekly_data = weekly_data.merge(
-            player_ids[['gsis_id', 'name', 'position']],
-            left_on='player_id',
-            right_on='gsis_id',
-            how='left'
-        )
-        
-        # FILTER OUT ROWS WITHOUT NAMES
-        valid_players = weekly_data[weekly_data['name'].notna()].copy()
+        stat_keys = list(parse_stat_list(stats)) if stats else LEADERBOARD_STATS.get(position, ['fppg'])
+    except QueryError as e:
+        return f"❌ {e}"
+    sort_key = resolve_stat_key(sort) if sort else stat_keys[0]
+    if sort_key is None:
+        return f"❌ Unknown sort stat: {sort}. Try: {', '.join(STAT_SUGGESTIONS)}"
+    if sort_key not in stat_keys:
+        stat_keys = [sort_key] + stat_keys
+    if len(stat_keys) > LEADERBOARD_MAX_STATS:
+        return f"❌ Pick at most {LEADERBOARD_MAX_STATS} stats"
+    
+    # THE PRE-SORTED ORDERING FOR THE SORT STAT, MINUS PLAYERS BELOW THE GAMES MINIMUM, THEN EVERY
+    # REQUESTED STAT FOR EVERY RANKED PLAYER IN ONE SLICE OF THE MATRIX
+    order = stat_matrix.orderings[(position, sort_key)]
+    rows = order[stat_matrix.games[order] >= MIN_GAMES]
+    if len(rows) == 0:
+        return f"❌ No {position} players with at least {MIN_GAMES} games"
+    values = stat_matrix.values[np.ix_(rows, [stat_matrix.columns[key] for key in stat_keys])]
+    
+    mark_stage('compute')
+    
+    def render_rank(i):
+        row = rows[i]
+        return render_stat_line(f"{i + 1}. **{stat_matrix.names[row]}** ({stat_matrix.games[row]} GP)", stat_keys, values[i])
+    
+    response = PagedResult(
+        f"**{season} {position} Leaderboard by {STAT_REGISTRY[sort_key].label}:**\n\n",
+        np.arange(len(rows)),
+        render_rank,
+        LEADERBOARD_PAGE_SIZE,
+        unit='players'
+    )
+    response.page(0)
+    
+    mark_stage('render')
+    return response
+
+# COMMAND: POSITION LEADERBOARD
+@bot.tree.command(name="leaderboard", description="Rank every player at a position across several stats")
+@app_commands.describe(
+    stats="Stats to show, separated by commas, e.g. fppg, rec/g, receiving_ypg",
+    sort="Stat to rank by (defaults to the first stat)"
+)
+async def leaderboard(
+    interaction: discord.Interaction,
+    position: str,
+    stats: Optional[str] = None,
+    sort: Optional[str] = None,
+    season: Optional[int] = None
+):
+    clock = metrics.clock('leaderboard')
+    try:
+        await interaction.response.defer()
+        clock.mark('defer')
         
-        # USE FUZZY MATCHING TO FIND THE PLAYER
-        player_names = valid_players['name'].unique().tolist()
-        match = process.extractOne(player_name, player_names, scorer=fuzz.ratio)
+        if seasons is None:
+            clock.outcome = 'busy'
+            await interaction.followup.send("❌ NFL data is still loading. Please try again in a moment.")
+            return
         
-        if match is None or match[1] < 60:
-            await interaction.followup.send(f"❌ Could not find player: {player_name}")
+        # DEFAULT TO THE CURRENT SEASON AND REJECT SEASONS WE HAVE NO DATA FOR
+        season = season or DEFAULT_SEASON
+        if season_error(season):
+            await interaction.followup.send(season_error(season))
             return
         
-        matched_name = match[0]
+        response = await cached_response(
+            clock, build_leaderboard_response, season,
+            position.strip().upper(), stats and stats.strip().lower(), sort and sort.strip().lower()
+        )
+        await send_response(interaction, response)
+        clock.mark('send')
         
-        # FILTER FOR SPECIFIC PLAYER AND WEEK
-        player_week_data = valid_players[
-            (valid_players['name'] == matched_name) & 
-            (valid_players['week'] == week)
-        ]
+    except WorkerQueueFull:
+        clock.outcome = 'busy'
+        await interaction.followup.send(BUSY_MESSAGE)
+    except Exception as e:
+        clock.outcome = 'error'
+        await interaction.followup.send(f"❌ Error building leaderboard: {str(e)}")
+        print(f"Error in leaderboard command: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        clock.finish()
+
+# BUILD THE /weeklystats RESPONSE (BLOCKING - RUNS ON THE WORKER POOL)
+def build_weeklystats_response(data, player_name, week):
+    season = data.season
+    weekly_store = data.weekly_store
+    
+    # USE FUZZY MATCHING TO FIND THE PLAYER
+    match = weekly_store.name_index.lookup(player_name)
+    mark_stage('match')
+    
+    if match is None:
+        return f"❌ Could not find player: {player_name}"
+    
+    ambiguous = ambiguous_name_message(data, match)
+    if ambiguous:
+        return ambiguous
+    
+    matched_name = match.name
+    
+    # LOOK UP THE PLAYER'S WEEK DIRECTLY FROM THE INDEX
+    player = weekly_store.get(match.player_ids[0], week)
+    
+    if player is None:
+        return f"❌ No data found for {matched_name} in week {week} of {season}"
+    
+    # GET STATS
+    passing_yards = int(player.get('passing_yards', 0))
+    rushing_yards = int(player.get('rushing_yards', 0))
+    receiving_yards = int(player.get('receiving_yards', 0))
+    receptions = int(player.get('receptions', 0))
+    passing_tds = int(player.get('passing_tds', 0))
+    rushing_tds = int(player.get('rushing_tds', 0))
+    receiving_tds = int(player.get('receiving_tds', 0))
+    fantasy_points = round(float(player.get('fantasy_points_ppr', 0)), 2)
+    
+    # GET POSITION
+    position = player['resolved_position']
+    
+    mark_stage('compute')
+    
+    # CREATE RESPONSE
+    response = f"**{season} Week {week} Stats for {matched_name}:**\n"
+    response += f"Position: {position}\n"
+    response += f"Opponent: {player.get('opponent_team', 'N/A')}\n\n"
+    
+    if position == 'QB':
+        response += f"Passing Yards: {passing_yards}\n"
+        response += f"Passing TDs: {passing_tds}\n"
+        response += f"Rushing Yards: {rushing_yards}\n"
+        response += f"Rushing TDs: {rushing_tds}\n"
+    elif position in ['RB', 'WR']:
+        response += f"Receiving Yards: {receiving_yards}\n"
+        response += f"Receptions: {receptions}\n"
+        response += f"Receiving TDs: {receiving_tds}\n"
+        response += f"Rushing Yards: {rushing_yards}\n"
+        response += f"Rushing TDs: {rushing_tds}\n"
+    elif position == 'TE':
+        response += f"Receiving Yards: {receiving_yards}\n"
+        response += f"Receptions: {receptions}\n"
+        response += f"Receiving TDs: {receiving_tds}\n"
+    
+    response += f"\nFantasy Points (PPR): {fantasy_points}"
+    
+    mark_stage('render')
+    return response
+
+# COMMAND: WEEKLY STATS
+@bot.tree.command(name="weeklystats", description="Get a player's stats for a specific week")
+async def weeklystats(interaction: discord.Interaction, player_name: str, week: int, season: Optional[int] = None):
+    clock = metrics.clock('weeklystats')
+    try:
+        await interaction.response.defer()
+        clock.mark('defer')
         
-        if player_week_data.empty:
-            await interaction.followup.send(f"❌ No data found for {matched_name} in week {week}")
+        if seasons is None:
+            clock.outcome = 'busy'
+            await interaction.followup.send("❌ Player data is still loading. Please try again in a moment.")
             return
         
-        player = player_week_data.iloc[0]
-        
-        # GET STATS
-        passing_yards = int(player.get('passing_yards', 0))
-        rushing_yards = int(player.get('rushing_yards', 0))
-        receiving_yards = int(player.get('receiving_yards', 0))
-        receptions = int(player.get('receptions', 0))
-        passing_tds = int(player.get('passing_tds', 0))
-        rushing_tds = int(player.get('rushing_tds', 0))
-        receiving_tds = int(player.get('receiving_tds', 0))
-        fantasy_points = round(float(player.get('fantasy_points_ppr', 0)), 2)
-        
-        # GET POSITION
-        position = player.get('position_y', player.get('position_x', player.get('position', 'N/A')))
-        
-        # CREATE RESPONSE
-        response = f"**Week {week} Stats for {matched_name}:**\n"
-        response += f"Position: {position}\n"
-        response += f"Opponent: {player.get('opponent_team', 'N/A')}\n\n"
-        
-        if position == 'QB':
-            response += f"Passing Yards: {passing_yards}\n"
-            response += f"Passing TDs: {passing_tds}\n"
-            response += f"Rushing Yards: {rushing_yards}\n"
-            response += f"Rushing TDs: {rushing_tds}\n"
-        elif position in ['RB', 'WR']:
-            response += f"Receiving Yards: {receiving_yards}\n"
-            response += f"Receptions: {receptions}\n"
-            response += f"Receiving TDs: {receiving_tds}\n"
-            response += f"Rushing Yards: {rushing_yards}\n"
-            response += f"Rushing TDs: {rushing_tds}\n"
-        elif position == 'TE':
-            response += f"Receiving Yards: {receiving_yards}\n"
-            response += f"Receptions: {receptions}\n"
-            response += f"Receiving TDs: {receiving_tds}\n"
-        
-        response += f"\nFantasy Points (PPR): {fantasy_points}"
+        # DEFAULT TO THE CURRENT SEASON AND REJECT SEASONS WE HAVE NO DATA FOR
+        season = season or DEFAULT_SEASON
+        if season_error(season):
+            await interaction.followup.send(season_error(season))
+            return
         
+        response = await cached_response(
+            clock, build_weeklystats_response, season, normalize_name(player_name), week
+        )
         await interaction.followup.send(response)
+        clock.mark('send')
         
+    except WorkerQueueFull:
+        clock.outcome = 'busy'
+        await interaction.followup.send(BUSY_MESSAGE)
     except Exception as e:
+        clock.outcome = 'error'
         await interaction.followup.send(f"❌ Error loading weekly stats: {str(e)}")
         print(f"Error in weeklystats command: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        clock.finish()
 
-# COMMAND: INJURY REPORT
-@bot.tree.command(name="injuryreport", description="Get injury/availability info for a player in 2024")
-async def injuryreport(interaction: discord.Interaction, player_name: str):
-    await interaction.response.defer()
+# STATS SHOWN BY /trend FOR EACH POSITION (STAT_REGISTRY KEYS)
+TREND_STATS = {
+    'QB': ['passing_ypg', 'rushing_ypg', 'pass_tdpg', 'fppg'],
+    'TE': ['receiving_ypg', 'rec_pg', 'tdpg', 'fppg'],
+}
+DEFAULT_TREND_STATS = ['receiving_ypg', 'rec_pg', 'rushing_ypg', 'tdpg', 'fppg']
+DEFAULT_TREND_WEEKS = 4
+
+# PER-GAME VALUE OF A REGISTRY STAT FROM WINDOW TOTALS
+def trend_value(totals, games, stat_key):
+    return sum(totals[field] for field in STAT_REGISTRY[stat_key].fields) / games
+
+def signed(value):
+    return f"+{value}" if value > 0 else f"{value}"
+
+# BUILD THE /trend RESPONSE (BLOCKING - RUNS ON THE WORKER POOL)
+def build_trend_response(data, player_name, weeks):
+    season = data.season
+    weekly_store = data.weekly_store
+    trends = weekly_store.trends
     
-    if player_data is None or player_ids is None:
-        await interaction.followup.send("❌ Player data is still loading. Please try again in a moment.")
-        return
+    # USE FUZZY MATCHING TO FIND THE PLAYER
+    match = weekly_store.name_index.lookup(player_name)
+    mark_stage('match')
+    
+    if match is None:
+        return f"❌ Could not find player: {player_name}"
+    
+    ambiguous = ambiguous_name_message(data, match)
+    if ambiguous:
+        return ambiguous
+    
+    player_id = match.player_ids[0]
+    last = trends.last_week
+    weeks = max(1, min(weeks, last))
+    first = last - weeks + 1
+    
+    # WINDOW AND SEASON TOTALS ARE EACH A DIFFERENCE OF TWO CUMULATIVE SLICES
+    window_totals, window_games = trends.window(player_id, first, last)
+    season_totals, season_games = trends.window(player_id, 1, last)
+    
+    if window_games == 0:
+        return f"❌ {match.name} didn't play in weeks {first}-{last} of {season}"
+    
+    # POSITION FROM THE PLAYER'S MOST RECENT GAME
+    recent = next(weekly_store.get(player_id, week) for week in range(last, 0, -1) if weekly_store.get(player_id, week))
+    position = recent['resolved_position']
     
+    mark_stage('compute')
+    
+    # CREATE RESPONSE
+    response = f"**{season} Trend for {match.name} ({position}), last {weeks} weeks (weeks {first}-{last}):**\n"
+    response += f"Games: {window_games} of {weeks}\n\n"
+    
+    for stat_key in TREND_STATS.get(position, DEFAULT_TREND_STATS):
+        recent_value = round(trend_value(window_totals, window_games, stat_key), 2)
+        season_value = round(trend_value(season_totals, season_games, stat_key), 2)
+        change = round(recent_value - season_value, 2)
+        response += f"{STAT_REGISTRY[stat_key].label}: {recent_value} (season {season_value}, {signed(change)})\n"
+    
+    # WEEK-OVER-WEEK FANTASY POINTS, EACH WEEK ALSO A DIFFERENCE OF CUMULATIVE SLICES
+    response += "\n**Week by week (PPR points):**\n"
+    previous = None
+    for week in range(first, last + 1):
+        totals, played = trends.window(player_id, week, week)
+        if not played:
+            response += f"Week {week}: did not play\n"
+            continue
+        points = round(totals['fantasy_points_ppr'], 2)
+        delta = f" ({signed(round(points - previous, 2))})" if previous is not None else ""
+        response += f"Week {week}: {points}{delta}\n"
+        previous = points
+    
+    mark_stage('render')
+    return response
+
+# COMMAND: TREND
+@bot.tree.command(name="trend", description="Get a player's averages over the last few weeks and week-over-week changes")
+async def trend(
+    interaction: discord.Interaction,
+    player_name: str,
+    weeks: Optional[int] = DEFAULT_TREND_WEEKS,
+    season: Optional[int] = None
+):
+    clock = metrics.clock('trend')
     try:
-        from rapidfuzz import process, fuzz
-        
-        # FILTER OUT ROWS WITHOUT NAMES
-        valid_players = player_data[player_data['name'].notna()].copy()
+        await interaction.response.defer()
+        clock.mark('defer')
         
-        # USE FUZZY MATCHING TO FIND THE PLAYER
-        player_names = valid_players['name'].tolist()
-        match = process.extractOne(player_name, player_names, scorer=fuzz.ratio)
+        if seasons is None:
+            clock.outcome = 'busy'
+            await interaction.followup.send("❌ Player data is still loading. Please try again in a moment.")
+            return
         
-        if match is None or match[1] < 60:
-            await interaction.followup.send(f"❌ Could not find player: {player_name}")
+        # DEFAULT TO THE CURRENT SEASON AND REJECT SEASONS WE HAVE NO DATA FOR
+        season = season or DEFAULT_SEASON
+        if season_error(season):
+            await interaction.followup.send(season_error(season))
             return
         
-        matched_name = match[0]
-        player = valid_players[valid_players['name'] == matched_name].iloc[0]
+        weeks = weeks or DEFAULT_TREND_WEEKS
         
-        # GET GAMES PLAYED
-        games_played = int(player.get('games', 0))
-        total_games = 17  # 2024 REGULAR SEASON
+        response = await cached_response(
+            clock, build_trend_response, season, normalize_name(player_name), weeks
+        )
+        await interaction.followup.send(response)
+        clock.mark('send')
         
-        # DETERMINE POSITION COLUMN
-        if 'position_y' in player.index:
-            position = player['position_y']
-        elif 'position_x' in player.index:
-            position = player['position_x']
-        else:
-            position = player.get('position', 'N/A')
-        
-        # CREATE RESPONSE
-        response = f"**2024 Season Availability for {matched_name}:**\n"
-        response += f"Position: {position}\n"
-        response += f"Games Played: {games_played}/{total_games}\n"
-        
-        if games_played == total_games:
-            response += f"\n✅ **Status:** Played full season (all {total_games} games)"
-        elif games_played >= 14:
-            missed = total_games - games_played
-            response += f"\n⚠️ **Status:** Missed {missed} game(s) - mostly available"
-        elif games_played >= 10:
-            missed = total_games - games_played
-            response += f"\n⚠️ **Status:** Missed {missed} games - significant time missed"
-        elif games_played >= 6:
-            missed = total_games - games_played
-            response += f"\n🔴 **Status:** Missed {missed} games - major availability issues"
-        else:
-            response += f"\n🔴 **Status:** Only played {games_played} games - season-ending/long-term injury"
+    except WorkerQueueFull:
+        clock.outcome = 'busy'
+        await interaction.followup.send(BUSY_MESSAGE)
+    except Exception as e:
+        clock.outcome = 'error'
+        await interaction.followup.send(f"❌ Error loading trend: {str(e)}")
+        print(f"Error in trend command: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        clock.finish()
+
+# BUILD THE /injuryreport RESPONSE (BLOCKING - RUNS ON THE WORKER POOL)
+def build_injuryreport_response(data, player_name):
+    season = data.season
+    
+    # USE FUZZY MATCHING TO FIND THE PLAYER
+    match = data.name_index.lookup(player_name)
+    mark_stage('match')
+    
+    if match is None:
+        return f"❌ Could not find player: {player_name}"
+    
+    ambiguous = ambiguous_name_message(data, match)
+    if ambiguous:
+        return ambiguous
+    
+    player = data.player_store.for_match(match)
+    matched_name = player.name
+    
+    # GET GAMES PLAYED
+    games_played = player.games
+    total_games = regular_season_games(season)
+    
+    # GET POSITION
+    position = player.position
+    
+    mark_stage('compute')
+    
+    # CREATE RESPONSE
+    response = f"**{season} Season Availability for {matched_name}:**\n"
+    response += f"Position: {position}\n"
+    response += f"Games Played: {games_played}/{total_games}\n"
+    
+    if games_played == total_games:
+        response += f"\n✅ **Status:** Played full season (all {total_games} games)"
+    elif games_played >= 14:
+        missed = total_games - games_played
+        response += f"\n⚠️ **Status:** Missed {missed} game(s) - mostly available"
+    elif games_played >= 10:
+        missed = total_games - games_played
+        response += f"\n⚠️ **Status:** Missed {missed} games - significant time missed"
+    elif games_played >= 6:
+        missed = total_games - games_played
+        response += f"\n🔴 **Status:** Missed {missed} games - major availability issues"
+    else:
+        response += f"\n🔴 **Status:** Only played {games_played} games - season-ending/long-term injury"
+    
+    response += f"\n\n*Note: This shows {season} historical data. For current/live injury reports, check official NFL sources.*"
+    
+    mark_stage('render')
+    return response
+
+# COMMAND: INJURY REPORT
+@bot.tree.command(name="injuryreport", description="Get injury/availability info for a player in a season")
+async def injuryreport(interaction: discord.Interaction, player_name: str, season: Optional[int] = None):
+    clock = metrics.clock('injuryreport')
+    try:
+        await interaction.response.defer()
+        clock.mark('defer')
+        
+        if seasons is None:
+            clock.outcome = 'busy'
+            await interaction.followup.send("❌ Player data is still loading. Please try again in a moment.")
+            return
         
-        response += "\n\n*Note: This shows 2024 historical data. For current/live injury reports, check official NFL sources.*"
+        # DEFAULT TO THE CURRENT SEASON AND REJECT SEASONS WE HAVE NO DATA FOR
+        season = season or DEFAULT_SEASON
+        if season_error(season):
+            await interaction.followup.send(season_error(season))
+            return
         
+        response = await cached_response(
+            clock, build_injuryreport_response, season, normalize_name(player_name)
+        )
         await interaction.followup.send(response)
+        clock.mark('send')
         
+    except WorkerQueueFull:
+        clock.outcome = 'busy'
+        await interaction.followup.send(BUSY_MESSAGE)
     except Exception as e:
+        clock.outcome = 'error'
         await interaction.followup.send(f"❌ Error loading injury report: {str(e)}")
         print(f"Error in injuryreport command: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        clock.finish()
+
+
+# BUILD THE /botstats RESPONSE FROM THE IN-PROCESS METRICS
+def build_botstats_response():
+    message = "**NFLStatSnap Bot Stats:**\n"
+    
+    # GROUP THE PER-OUTCOME HISTOGRAMS BY COMMAND
+    commands_seen = {}
+    for (_, command, outcome), hist in metrics.snapshot('command'):
+        commands_seen.setdefault(command, {})[outcome] = hist
+    if not commands_seen:
+        message += "No commands served yet\n"
+    for command, outcomes in commands_seen.items():
+        calls = sum(hist.count for hist in outcomes.values())
+        message += f"/{command}: {calls} calls"
+        if 'ok' in outcomes:
+            hist = outcomes['ok']
+            message += f", p50 {hist.percentile(50) * 1000:.1f} ms, p99 {hist.percentile(99) * 1000:.1f} ms"
+        rejected = [f"{outcomes[outcome].count} {outcome}" for outcome in COMMAND_OUTCOMES[1:] if outcome in outcomes]
+        if rejected:
+            message += f" ({', '.join(rejected)})"
+        message += "\n"
+        
+        # AVERAGE TIME PER STAGE, IN THE ORDER THE STAGES HAPPEN
+        stages = {key[2]: stage for key, stage in metrics.snapshot('stage') if key[1] == command}
+        ordered = [name for name in ['defer', 'load', 'cache', 'queue', 'match', 'compute', 'render', 'send'] if name in stages]
+        message += "  " + ", ".join(
+            f"{name} {stages[name].total / stages[name].count * 1000:.1f}" for name in ordered
+        ) + " (avg ms)\n"
+    
+    for (_, kind), hist in metrics.snapshot('dataset'):
+        message += f"Last {kind}: {hist.recent[-1]:.1f} s ({hist.count} total)\n"
+    
+    lookups = response_cache.hits + response_cache.misses
+    if lookups:
+        message += f"Response cache: {response_cache.hits / lookups:.0%} hit rate, {len(response_cache)} entries\n"
+    
+    if SHARD_COUNT:
+        shards = SHARD_IDS if SHARD_IDS is not None else range(SHARD_COUNT)
+        message += f"Shards in this process: {', '.join(str(shard) for shard in shards)} of {SHARD_COUNT}\n"
+    
+    if seasons is not None:
+        message += f"Seasons loaded: {', '.join(str(s) for s in seasons.loaded())} ({seasons.memory_bytes() / 1e6:.0f} MB)"
+    return message
+
+# COMMAND: BOT STATS (ADMIN ONLY)
+@bot.tree.command(name="botstats", description="Show command latency and cache statistics")
+@app_commands.default_permissions(administrator=True)
+async def botstats(interaction: discord.Interaction):
+    await interaction.response.send_message(build_botstats_response(), ephemeral=True)
+
+
+# CURRENT RESIDENT MEMORY OF THE BOT PROCESS IN BYTES (None WHERE /proc ISN'T AVAILABLE)
+def process_rss_bytes():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+# BUILD THE /memoryreport RESPONSE
+def build_memoryreport_response():
+    message = "**NFLStatSnap Memory Report:**\n"
+    
+    rss = process_rss_bytes()
+    if rss is not None:
+        message += f"Process RSS: {rss / 2**20:.1f} MB\n"
+    if player_ids is not None:
+        message += f"Player ID table: {player_ids.memory_usage(deep=True).sum() / 2**20:.1f} MB ({len(player_ids)} players)\n"
+    
+    if seasons is None:
+        return message + "NFL data is still loading"
+    
+    message += f"Seasons: {seasons.memory_bytes() / 2**20:.1f} MB of {SEASON_MEMORY_MB} MB budget\n"
+    for season in seasons.loaded():
+        data = seasons.peek(season)
+        if data is None:
+            continue
+        parts = ", ".join(f"{part} {size / 2**20:.1f}" for part, size in data.memory_breakdown.items())
+        message += f"• {season}: {data.memory_bytes / 2**20:.1f} MB ({parts})\n"
+    
+    message += f"Response cache: {len(response_cache)} entries"
+    return message
+
+# COMMAND: MEMORY REPORT (ADMIN ONLY)
+@bot.tree.command(name="memoryreport", description="Show memory used by the loaded NFL data")
+@app_commands.default_permissions(administrator=True)
+async def memoryreport(interaction: discord.Interaction):
+    await interaction.response.send_message(build_memoryreport_response(), ephemeral=True)
+
+
+# AUTOCOMPLETE HANDLERS
+# THESE RUN DIRECTLY ON THE EVENT LOOP (NO WORKER POOL HOP) SINCE EACH LOOKUP IS A FEW MICROSECONDS
+# AUTOCOMPLETE USES WHICHEVER SEASON THE USER PICKED IF IT'S ALREADY LOADED, OTHERWISE THE DEFAULT SEASON
+def autocomplete_season(interaction):
+    if seasons is None:
+        return None
+    season = getattr(interaction.namespace, 'season', None) or DEFAULT_SEASON
+    return seasons.peek(season) or seasons.peek(DEFAULT_SEASON)
+
+async def player_name_autocomplete(interaction: discord.Interaction, current: str):
+    data = autocomplete_season(interaction)
+    if data is None:
+        return []
+    return to_player_choices(data.autocomplete.suggest(current))
+
+async def team_autocomplete(interaction: discord.Interaction, current: str):
+    data = autocomplete_season(interaction)
+    if data is None:
+        return []
+    return to_choices(filter_choices(sorted(data.roster_cache.teams), current))
 
+async def position_autocomplete(interaction: discord.Interaction, current: str):
+    data = autocomplete_season(interaction)
+    positions = ROSTER_POSITIONS if data is None else sorted(data.stat_matrix.position_set)
+    return to_choices(filter_choices(positions, current))
+
+# COMPLETES THE LAST CONDITION OF A QUERY, SO "fppg>=15 and re" SUGGESTS "fppg>=15 and receptions", ...
+async def stat_autocomplete(interaction: discord.Interaction, current: str):
+    head, separator, tail = current.rpartition(' and ')
+    if QUERY_CONDITION.match(tail):
+        return to_choices([current])
+    return to_choices([head + separator + stat for stat in filter_choices(STAT_SUGGESTIONS, tail.strip())])
+
+# COMPLETES THE LAST ENTRY OF A COMMA-SEPARATED LIST, SO "fppg, re" SUGGESTS "fppg, receptions", ...
+async def stat_list_autocomplete(interaction: discord.Interaction, current: str):
+    head, separator, tail = current.rpartition(',')
+    prefix = head + separator + (' ' if separator else '')
+    return to_choices([prefix + stat for stat in filter_choices(STAT_SUGGESTIONS, tail.strip())])
+
+async def player_list_autocomplete(interaction: discord.Interaction, current: str):
+    data = autocomplete_season(interaction)
+    if data is None:
+        return []
+    head, separator, tail = current.rpartition(',')
+    prefix = head + separator + (' ' if separator else '')
+    return to_player_choices([(prefix + label, prefix + value) for label, value in data.autocomplete.suggest(tail.strip())])
+
+playerstats.autocomplete('player_name')(player_name_autocomplete)
+comparestats.autocomplete('player1')(player_name_autocomplete)
+comparestats.autocomplete('player2')(player_name_autocomplete)
+compareplayers.autocomplete('players')(player_list_autocomplete)
+compareplayers.autocomplete('stats')(stat_list_autocomplete)
+weeklystats.autocomplete('player_name')(player_name_autocomplete)
+trend.autocomplete('player_name')(player_name_autocomplete)
+injuryreport.autocomplete('player_name')(player_name_autocomplete)
+roster.autocomplete('team')(team_autocomplete)
+filterbystat.autocomplete('position')(position_autocomplete)
+filterbystat.autocomplete('stat')(stat_autocomplete)
+filterbystat.autocomplete('sort')(stat_autocomplete)
+leaderboard.autocomplete('position')(position_autocomplete)
+leaderboard.autocomplete('stats')(stat_list_autocomplete)
+leaderboard.autocomplete('sort')(stat_autocomplete)
+
+
+# SHARDED RUN MODE (SHARD_PROCESSES > 1)
+# THIS PROCESS BECOMES A SUPERVISOR THAT NEVER CONNECTS TO DISCORD. IT LOADS THE PLAYER LIST AND THE
+# DEFAULT SEASON ONCE, PUBLISHES THEM AS SNAPSHOTS, THEN STARTS ONE WORKER PER SHARD GROUP (A COPY OF
+# bot.py RUNNING AN AutoShardedBot FOR ITS SHARDS). WORKERS MEMORY-MAP THOSE SNAPSHOTS (AND THE DATA
+# PACK, IF ANY) INSTEAD OF DOWNLOADING AND COMPACTING THE RAW FRAMES, SO THE FEATHER FILES SIT IN THE
+# PAGE CACHE ONCE FOR ALL OF THEM. THE SUPERVISOR RUNS THE REFRESH AND RESTARTS WORKERS THAT DIE
+SUPERVISOR_POLL_SECONDS = 5
+
+# SHARDS FOR WORKER index: 0, P, 2P, ... THEN 1, P+1, ... FOR P PROCESSES
+def shard_worker_ids(index):
+    return [shard for shard in range(SHARD_COUNT) if shard % SHARD_PROCESSES == index]
+
+def start_shard_worker(index):
+    shard_ids = shard_worker_ids(index)
+    env = dict(os.environ, SHARD_WORKER=str(index), SHARD_COUNT=str(SHARD_COUNT), SHARD_IDS=','.join(map(str, shard_ids)))
+    if METRICS_PORT:
+        env['METRICS_PORT'] = str(METRICS_PORT + index)  # ONE /metrics ENDPOINT PER WORKER
+    print(f"Starting shard worker {index} (shards {', '.join(map(str, shard_ids))} of {SHARD_COUNT})")
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__)], env=env)
+
+# MAKE SURE THE SNAPSHOTS WORKERS READ MATCH WHAT THE SUPERVISOR LOADED (A DOWNLOAD OR SNAPSHOT
+# RESTORE HAS ALREADY WRITTEN THEM, A DATA PACK HASN'T)
+def publish_shared_data():
+    data = seasons.peek(DEFAULT_SEASON)
+    if DATA_PACK or not os.path.exists(snapshot_path('ids.feather')):
+        save_ids_snapshot(player_ids)
+    if data.source == 'pack':
+        save_season_snapshot(data)
+    map_shared_season()
+
+# SWAP THE SUPERVISOR'S OWN COPY OF THE CURRENT SEASON (BUILT FROM A DOWNLOAD OR A REFRESH) FOR ONE
+# READ FROM THE SNAPSHOT IT JUST WROTE, SO IT MAPS THE SAME FILES AS ITS WORKERS INSTEAD OF KEEPING
+# A PRIVATE COPY OF THEM
+def map_shared_season():
+    data = seasons.peek(DEFAULT_SEASON)
+    shared = load_season_snapshot(DEFAULT_SEASON, player_ids)
+    if shared is not None:
+        seasons.replace(data, shared)
+
+def run_sharded():
+    if not SNAPSHOT_DIR:
+        sys.exit("Sharded mode shares data through snapshots - set SNAPSHOT_DIR")
+    if SHARD_COUNT < SHARD_PROCESSES:
+        sys.exit(f"SHARD_COUNT ({SHARD_COUNT}) must be at least SHARD_PROCESSES ({SHARD_PROCESSES})")
+    
+    # TURN SIGTERM INTO A NORMAL EXIT SO THE WORKERS ARE STOPPED WITH US
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
+    load_nfl_data()
+    publish_shared_data()
+    
+    workers = {index: start_shard_worker(index) for index in range(SHARD_PROCESSES)}
+    next_refresh = time.monotonic() + REFRESH_MINUTES * 60
+    try:
+        while True:
+            time.sleep(SUPERVISOR_POLL_SECONDS)
+            for index, process in list(workers.items()):
+                code = process.poll()
+                if code is not None:
+                    print(f"Shard worker {index} exited with code {code}, restarting it")
+                    workers[index] = start_shard_worker(index)
+            
+            if time.monotonic() >= next_refresh:
+                next_refresh = time.monotonic() + REFRESH_MINUTES * 60
+                try:
+                    current = seasons.peek(DEFAULT_SEASON)
+                    refresh_current_season()
+                    if seasons.peek(DEFAULT_SEASON) is not current:
+                        map_shared_season()
+                except Exception as e:
+                    print(f"Error refreshing NFL data: {e}")
+                    import traceback
+                    traceback.print_exc()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in workers.values():
+            process.terminate()
+        for process in workers.values():
+            process.wait()
 
-# RUN THE BOT
-bot.run(TOKEN)
+# RUN THE BOT (SKIPPED WHEN bot.py IS IMPORTED, E.G. BY bench.py)
+if __name__ == '__main__':
+    if SHARD_PROCESSES > 1 and not SHARD_WORKER:
+        run_sharded()
+    else:
+        bot.run(TOKEN)
 
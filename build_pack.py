@@ -0,0 +1,112 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import tarfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.feather as feather
+
+import bot
+
+# OFFLINE DATA-PACK BUILDER
+# DOWNLOADS THE PLAYER ID TABLE PLUS SEASONAL, WEEKLY, ROSTER AND PLAY-BY-PLAY USAGE DATA FOR THE CHOSEN SEASONS, RUNS THEM
+# THROUGH THE SAME MERGE + COMPACTION THE BOT USES, PRECOMPUTES THE STAT MATRIX AND TREND TOTALS, AND WRITES
+# EVERYTHING INTO ONE VERSIONED, CHECKSUMMED BUNDLE (SEE bot.DataPack FOR THE LAYOUT). BUILD ONCE, COPY THE
+# FILE TO EVERY BOT NODE, AND START THE BOT WITH DATA_PACK=<file> IN .ENV
+#
+# USAGE: python build_pack.py --seasons 2022 2023 2024 --output nflstatsnap.pack
+
+def frame_bytes(frame):
+    sink = pa.BufferOutputStream()
+    feather.write_feather(frame.reset_index(drop=True), sink, compression='uncompressed', chunksize=max(len(frame), 1))
+    return sink.getvalue().to_pybytes()
+
+def array_bytes(array):
+    sink = io.BytesIO()
+    np.save(sink, np.ascontiguousarray(array))
+    return sink.getvalue()
+
+def add_member(tar, name, payload):
+    info = tarfile.TarInfo(name)
+    info.size = len(payload)
+    info.mtime = int(time.time())
+    tar.addfile(info, io.BytesIO(payload))
+
+# WRITE THE PACK TO path (VIA A TEMP FILE, SO A FAILED BUILD NEVER LEAVES HALF A PACK BEHIND)
+# RETURNS THE SHA-256 OF THE WHOLE FILE
+def write_pack(path, version, ids, season_data):
+    members = {'ids.feather': frame_bytes(ids)}
+    for data in season_data:
+        members[f'{data.season}/season.feather'] = frame_bytes(data.frame)
+        members[f'{data.season}/weekly.feather'] = frame_bytes(data.weekly_store.to_frame())
+        members[f'{data.season}/rosters.feather'] = frame_bytes(data.roster_cache.to_frame())
+        if data.usage is not None:
+            members[f'{data.season}/usage.feather'] = frame_bytes(data.usage.to_frame())
+        for name, array in bot.season_arrays(data).items():
+            members[f'{data.season}/{name}'] = array_bytes(array)
+
+    manifest = {
+        'format': bot.DATA_PACK_FORMAT,
+        'version': version,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'seasons': [data.season for data in season_data],
+        'players': {str(data.season): len(data.player_store) for data in season_data},
+        'files': {name: hashlib.sha256(payload).hexdigest() for name, payload in members.items()},
+    }
+
+    tmp = f'{path}.tmp'
+    with tarfile.open(tmp, 'w', format=tarfile.PAX_FORMAT) as tar:
+        add_member(tar, 'manifest.json', json.dumps(manifest, indent=2).encode())
+        for name, payload in members.items():
+            add_member(tar, name, payload)
+    os.replace(tmp, path)
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(2**20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an NFLStatSnap data pack")
+    parser.add_argument('--seasons', type=int, nargs='+', default=[bot.DEFAULT_SEASON])
+    parser.add_argument('--output', default='nflstatsnap.pack')
+    parser.add_argument('--version', default=datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S'),
+                        help="label stored in the pack (defaults to the build time)")
+    args = parser.parse_args()
+
+    for season in args.seasons:
+        error = bot.season_error(season)
+        if error:
+            parser.error(f"{season}: {error}")
+
+    start = time.perf_counter()
+    print("Loading player ID data...")
+    ids = bot.compact_player_ids(bot.fetch_dataset('ids'))
+
+    season_data = []
+    for season in sorted(set(args.seasons)):
+        print(f"Loading {season} NFL season data...")
+        seasonal = bot.fetch_dataset('seasonal', season)
+        weekly = bot.fetch_dataset('weekly', season)
+        rosters = bot.fetch_dataset('rosters', season)
+        usage = bot.load_usage(season)
+        data = bot.build_season_data(season, seasonal, weekly, rosters, ids, usage)
+        print(f"  {len(data.player_store)} players, {len(data.weekly_store)} player-weeks, {len(data.roster_cache)} team rosters")
+        season_data.append(data)
+
+    checksum = write_pack(args.output, args.version, ids, season_data)
+    with open(f'{args.output}.sha256', 'w') as f:
+        f.write(f'{checksum}  {os.path.basename(args.output)}\n')
+
+    size_mb = os.path.getsize(args.output) / 2**20
+    print(f"Wrote {args.output} (version {args.version}, {size_mb:.1f} MB) in {time.perf_counter() - start:.1f}s")
+    print(f"sha256 {checksum}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import bot
+import bench
+
+# OFFLINE CHECKS FOR THE /filterbystat QUERY LANGUAGE AND THE INCREMENTAL SEASON REFRESH
+# RUN WITH: python -m pytest -q
+
+SEASON = 2024
+SPLIT_WEEK = 10
+
+# SEASON TOTALS THE WAY import_seasonal_data SHAPES THEM, FROM JUST THE GIVEN WEEKS
+def seasonal_from(weekly, seasonal):
+    regular = weekly[weekly['season_type'] == 'REG']
+    grouped = regular.groupby('player_id')
+    totals = grouped[bench.STAT_COLUMNS].sum().reset_index()
+    totals['games'] = grouped.size().values
+    totals['season'] = SEASON
+    totals['season_type'] = 'REG'
+    return totals.merge(seasonal[['player_id', 'tgt_sh', 'ay_sh']], on='player_id', how='left')
+
+@pytest.fixture(scope='module')
+def dataset():
+    ids, seasonal, weekly, rosters = bench.make_dataset(300, 18, SEASON, seed=7)
+    return bot.compact_player_ids(ids), seasonal, weekly, rosters
+
+@pytest.fixture(scope='module')
+def season_data(dataset):
+    ids, seasonal, weekly, rosters = dataset
+    return bot.build_season_data(SEASON, seasonal, weekly, rosters, ids)
+
+@pytest.mark.parametrize('text, conditions', [
+    ('fppg>=15', [('fppg', '>=', 15.0), ('games', '>=', bot.MIN_GAMES)]),
+    ('fppg>=15 and games>=10', [('fppg', '>=', 15.0), ('games', '>=', 10.0)]),
+    ('rec/g > 5, receiving_ypg<=80.5', [('rec_pg', '>', 5.0), ('receiving_ypg', '<=', 80.5), ('games', '>=', bot.MIN_GAMES)]),
+    ('Rushing_YPG != 0 && games = 3', [('rushing_ypg', '!=', 0.0), ('games', '=', 3.0)]),
+    ('tdpg>-1 & games==17', [('tdpg', '>', -1.0), ('games', '==', 17.0)]),
+])
+def test_compile_query_accepts(text, conditions):
+    query = bot.compile_query(text)
+    assert [tuple(condition) for condition in query.conditions] == conditions
+    assert query.sort_key == conditions[0][0]
+
+@pytest.mark.parametrize('text, sort', [
+    ('fppg>>15', None),
+    ('fppg>=', None),
+    ('fppg>=fifteen', None),
+    ('>=15', None),
+    ('notastat>=3', None),
+    ('fppg>=15 or games>=10', None),
+    ('fppg>=15', 'notastat'),
+])
+def test_compile_query_rejects(text, sort):
+    with pytest.raises(bot.QueryError):
+        bot.compile_query(text, sort)
+
+def test_compile_query_sort():
+    query = bot.compile_query('games>=10', 'rec/g')
+    assert query.sort_key == 'rec_pg'
+    assert query.shown == ['rec_pg']
+
+@pytest.mark.parametrize('stat, key', [
+    ('Fantasy PPR', 'fppg'),
+    ('fppg', 'fppg'),
+    ('pass ypg', 'passing_ypg'),
+    ('rush yards per game', 'rushing_ypg'),
+    ('Receiving YPG', 'receiving_ypg'),
+    ('pass tdpg', 'pass_tdpg'),
+    ('td per game', 'tdpg'),
+    ('receptions per game', 'rec_pg'),
+    ('ypg', None),
+    ('tackles', None),
+])
+def test_resolve_loose_stat_key(stat, key):
+    assert bot.resolve_loose_stat_key(stat) == key
+
+def test_filterbystat_loose_stat_name(season_data):
+    loose = bot.build_filterbystat_response(season_data, 'wr', 'Fantasy PPR', 5.0)
+    exact = bot.build_filterbystat_response(season_data, 'wr', 'fppg', 5.0)
+    assert isinstance(loose, bot.PagedResult)
+    assert list(loose.rows) == list(exact.rows)
+
+def test_filterbystat_rejects_threshold_with_query(season_data):
+    response = bot.build_filterbystat_response(season_data, 'WR', 'fppg<50', 99.0)
+    assert isinstance(response, str) and response.startswith('❌')
+    assert isinstance(bot.build_filterbystat_response(season_data, 'WR', 'fppg<50'), bot.PagedResult)
+
+def test_filterbystat_needs_threshold_for_bare_stat(season_data):
+    response = bot.build_filterbystat_response(season_data, 'WR', 'fppg')
+    assert isinstance(response, str) and response.startswith('❌')
+
+# A SEASON EXTENDED WEEK BY WEEK MUST MATCH ONE BUILT FROM THE FULL DOWNLOAD
+def test_extend_season_data_matches_full_build(dataset, season_data):
+    ids, seasonal, weekly, rosters = dataset
+    early = weekly[weekly['week'] <= SPLIT_WEEK]
+    partial = bot.build_season_data(SEASON, seasonal_from(early, seasonal), early, rosters, ids)
+    assert bot.extend_season_data(partial, early, ids) is None
+
+    extended = bot.extend_season_data(partial, weekly, ids)
+    full = season_data
+    assert extended.version > partial.version
+    assert extended.last_week == full.last_week
+
+    # SEASON LINES
+    assert set(extended.player_store.records) == set(full.player_store.records)
+    for player_id, record in full.player_store.records.items():
+        other = extended.player_store.get(player_id)
+        for field in bot.PLAYER_STAT_FIELDS:
+            assert getattr(other, field) == pytest.approx(getattr(record, field)), (player_id, field)
+
+    # WEEKLY ROWS AND TREND TOTALS
+    assert set(extended.weekly_store.spans) == set(full.weekly_store.spans)
+    for player_id in full.weekly_store.spans:
+        for week in range(1, full.last_week + 1):
+            expected, actual = full.weekly_store.get(player_id, week), extended.weekly_store.get(player_id, week)
+            assert (expected is None) == (actual is None), (player_id, week)
+            if expected is not None:
+                pd.testing.assert_series_equal(pd.Series(actual, dtype=object), pd.Series(expected, dtype=object), check_names=False)
+        trends = extended.weekly_store.trends
+        np.testing.assert_allclose(
+            trends.cumulative[trends.index[player_id]],
+            full.weekly_store.trends.cumulative[full.weekly_store.trends.index[player_id]]
+        )
+
+    # STAT MATRIX VALUES AND PERCENTILES, ROW BY PLAYER
+    rows = [extended.stat_matrix.row_of[player_id] for player_id in full.stat_matrix.row_of]
+    np.testing.assert_allclose(extended.stat_matrix.values[rows], full.stat_matrix.values)
+    np.testing.assert_allclose(extended.stat_matrix.percentiles[rows], full.stat_matrix.percentiles)
+
+# A NAME TWO PLAYERS SHARE IS LISTED, NOT GUESSED, AND AUTOCOMPLETE OFFERS EACH PLAYER BY ID
+def test_shared_name_lists_players(season_data):
+    name, choices = next(iter(season_data.autocomplete.shared.items()))
+    assert len(choices) > 1
+    assert [label for label, _ in season_data.autocomplete.suggest(name)[:len(choices)]] == [label for label, _ in choices]
+
+    response = bot.build_playerstats_response(season_data, name)
+    assert response.startswith('❓')
+    assert all(label in response for label, _ in choices)
+
+    for label, player_id in choices:
+        response = bot.build_playerstats_response(season_data, player_id)
+        assert f"Position: {season_data.player_store.get(player_id).position}" in response